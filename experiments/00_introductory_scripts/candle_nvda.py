@@ -1,12 +1,15 @@
 import matplotlib.pyplot as plt
 import pandas as pd
 import mplfinance as mpf
-import yfinance as yf
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from ohlcv_cache import download
 
 # Download NVDA stock data for the last 90 days
 ticker = 'NVDA'
-stock = yf.Ticker(ticker)
-data = stock.history(period='30d')
+data = download(ticker, period='30d')
 
 # Plot the candlestick graph
 mpf.plot(data, type='candle', style='charles', title='NVDA Candlestick Graph', ylabel='Price (USD)')
\ No newline at end of file
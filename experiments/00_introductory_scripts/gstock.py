@@ -1,6 +1,10 @@
 import matplotlib.pyplot as plt
 import pandas as pd
-import yfinance as yf
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from ohlcv_cache import download
 
 # Download NVDA stock data for the last 30 days
 ticker = input("Ticker symbol? ")
@@ -12,7 +16,7 @@ days = str(days) + "d"
 window_size = int(input("What moving average size? "))
 window_size2 = int(input("What moving average2 size? "))
 
-data = yf.download(ticker, period=days)
+data = download(ticker, period=days)
 # Calculate the moving average
 # window_size = 5
 data['Moving_Avg'] = data['Close'].rolling(window=window_size).mean()
@@ -1,10 +1,14 @@
 import matplotlib.pyplot as plt
 import pandas as pd
-import yfinance as yf
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from ohlcv_cache import download
 
 # Download NVDA stock data for the last 30 days
 ticker = 'NVDA'
-data = yf.download(ticker, period='30d')
+data = download(ticker, period='30d')
 
 # Calculate the moving average
 window_size = 5
@@ -0,0 +1,88 @@
+"""
+Chunked streaming loader for one column of a large bar CSV.
+
+The first load streams only the requested column through pd.read_csv in chunks
+and writes it into a float32 sidecar file next to the CSV
+(historical_stock_data.csv.Close.f32). Later loads memory-map the sidecar, so
+training on years of minute bars starts immediately and memory stays flat.
+The sidecar is rebuilt automatically when the CSV's size or mtime changes.
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+CHUNK_ROWS = 1_000_000
+
+
+def count_rows(csv_file, block_size=1 << 24):
+    """Number of data rows (lines minus header), counted without parsing."""
+    lines = 0
+    last = b"\n"
+    with open(csv_file, "rb") as f:
+        while True:
+            block = f.read(block_size)
+            if not block:
+                break
+            lines += block.count(b"\n")
+            last = block[-1:]
+    if last != b"\n":
+        lines += 1  # final line without trailing newline
+    return max(lines - 1, 0)
+
+
+def _signature(csv_file):
+    st = os.stat(csv_file)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns}
+
+
+def _stream_into(csv_file, column, out, chunk_rows):
+    pos = 0
+    for chunk in pd.read_csv(csv_file, usecols=[column], dtype={column: np.float32}, chunksize=chunk_rows):
+        values = chunk[column].to_numpy()
+        out[pos:pos + len(values)] = values
+        pos += len(values)
+    return pos
+
+
+def load_column(csv_file, column="Close", sidecar=True, chunk_rows=CHUNK_ROWS):
+    """
+    float32 array with one column of csv_file.
+    With sidecar=True the result is a read-only np.memmap over the cached binary file;
+    otherwise the column is parsed into a preallocated in-memory array.
+    """
+    data_path = f"{csv_file}.{column}.f32"
+    meta_path = f"{csv_file}.{column}.json"
+    signature = _signature(csv_file)
+
+    if sidecar and os.path.exists(meta_path) and os.path.exists(data_path):
+        with open(meta_path) as f:
+            meta = json.load(f)
+        if meta["source"] == signature:
+            if meta["length"] == 0:
+                return np.empty(0, dtype=np.float32)
+            return np.memmap(data_path, dtype=np.float32, mode="r", shape=(meta["length"],))
+
+    n = count_rows(csv_file)
+    if not sidecar:
+        out = np.empty(n, dtype=np.float32)
+        return out[:_stream_into(csv_file, column, out, chunk_rows)]
+
+    if n == 0:
+        open(data_path, "wb").close()
+        length = 0
+    else:
+        out = np.memmap(data_path, dtype=np.float32, mode="w+", shape=(n,))
+        length = _stream_into(csv_file, column, out, chunk_rows)
+        out.flush()
+        del out
+        if length < n:  # blank lines counted by count_rows
+            with open(data_path, "r+b") as f:
+                f.truncate(length * 4)
+
+    tmp = meta_path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump({"source": signature, "length": length}, f)
+    os.replace(tmp, meta_path)
+    return load_column(csv_file, column, sidecar=True, chunk_rows=chunk_rows)
@@ -1,14 +1,14 @@
 import torch
 import torch.nn as nn
 from torch.utils.data import Dataset, DataLoader
-import pandas as pd
+from csv_stream import load_column
 
 # 1. Dataset
 class StockDataset(Dataset):
     def __init__(self, csv_file, seq_length=20):
-        self.data = pd.read_csv(csv_file)
+        # Only the Close column is streamed in; later runs memory-map the cached sidecar
         self.seq_length = seq_length
-        self.prices = self.data['Close'].values
+        self.prices = load_column(csv_file, 'Close')
 
     def __len__(self):
         return len(self.prices) - self.seq_length
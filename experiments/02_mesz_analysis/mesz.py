@@ -1,20 +1,28 @@
 import mplfinance as mpf
-import pandas as pd
-import yfinance as yf
+import os
+import sys
 
-df = yf.download('MESZ25.CME', interval='1d', auto_adjust=True)
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from indicators import indicator_frame
+from lod import OHLCPyramid
+from ohlcv_cache import download
+
+MAX_CANDLES = 600  # about one candle per 2 pixels of a default mplfinance figure
+
+df = download('MESZ25.CME', period='max', interval='1d')
 
 # Ensure DataFrame is not empty and columns are valid
 if not df.empty:
+    # download() already returns numeric OHLCV without missing prices (common/normalize.py)
     ohlc_cols = [col for col in ['Open', 'High', 'Low', 'Close'] if col in df.columns]
-    for col in ohlc_cols + (['Volume'] if 'Volume' in df.columns else []):
-        df[col] = pd.to_numeric(df[col], errors='coerce')
 
     if ohlc_cols:
-        df = df.dropna(subset=ohlc_cols)
+        emas = indicator_frame(df, ['EMA200', 'EMA20', 'EMA10'])
+        emas.columns = ['EMA_200', 'EMA_20', 'EMA_10']
+        df = df.join(emas)
 
-        for span, name, color in [(200, 'EMA_200', 'blue'), (20, 'EMA_20', 'orange'), (10, 'EMA_10', 'green')]:
-            df[name] = df[ohlc_cols[-1]].ewm(span=span, adjust=False).mean()
+        # aggregate long histories into at most MAX_CANDLES buckets (EMAs computed on all bars first)
+        df = OHLCPyramid(df, extra=emas.columns).frame(max_buckets=MAX_CANDLES)
 
         addplots = [mpf.make_addplot(df[name], color=color, width=1.2)
                     for name, color in zip(['EMA_200', 'EMA_20', 'EMA_10'], ['blue', 'orange', 'green'])]
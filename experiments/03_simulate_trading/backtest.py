@@ -0,0 +1,264 @@
+"""
+Vectorized backtest core for the trading simulator
+
+backtest() takes a price matrix (days x instruments) and an order matrix of the
+same shape (shares to buy > 0 or sell < 0 on each day) and returns the fills,
+the cash path, the holdings and the equity curve. It keeps the rules of
+Portfolio.buy / Portfolio.sell:
+
+- a buy fills only if the cash at that moment covers price * amount, otherwise it is skipped
+- a sell fills only if the holding covers the amount (no shorting), otherwise it is skipped
+- orders are processed day by day, instruments in column order within a day
+
+A sell only depends on the instrument's own earlier fills, so the no-short rule
+is a scan over days vectorized across instruments. A buy depends on every fill
+before it through the cash, which is the one genuinely sequential check: it runs
+optimistically on whole blocks of days (cash before every order as a cumulative
+sum, assuming every buy fills), and only the days where the cash might run short
+go through a scalar loop. Everything else (order sizes, cash path, holdings,
+equity) is plain array arithmetic.
+
+Leading axes are batch axes: prices of shape (paths, days, instruments) run many
+independent backtests at once. When many of them may run short, the exact check
+starts at the first such day and steps through the rest vectorized across the
+backtests.
+
+    prices = np.column_stack([stock.history for stock in stocks])
+    result = backtest(prices, signal_orders(-np.sign(np.diff(prices, axis=0, prepend=np.nan))), cash=10000)
+    result["equity"]                                # portfolio value after each day's trades
+"""
+import numpy as np
+
+BATCH_ROWS = 32   # from this many backtests the check is vectorized across backtests
+DAY_STEP_INSTRUMENTS = 32  # from this many instruments that check steps per day instead of per order
+TOLERANCE = 1e-9  # optimistic checks closer than this to the limit are re-checked exactly
+
+
+# -----------------------------
+# ORDERS
+# -----------------------------
+def signal_orders(signals, amount=1):
+    """Orders from signals: buy `amount` where signal > 0, sell it where signal < 0 (NaN: no trade)."""
+    signals = np.nan_to_num(np.asarray(signals, dtype=np.float64))
+    return np.sign(signals) * amount
+
+
+def target_orders(targets, holdings=None):
+    """
+    Orders that move the holdings to `targets` (shares per day and instrument).
+    Trades are the day-over-day changes of the targets; a rejected trade is not retried.
+    """
+    targets = np.nan_to_num(np.asarray(targets, dtype=np.float64))
+    start = np.zeros(targets.shape[:-2] + (1, targets.shape[-1])) if holdings is None \
+        else np.broadcast_to(np.asarray(holdings, dtype=np.float64)[..., None, :],
+                             targets.shape[:-2] + (1, targets.shape[-1]))
+    return np.diff(targets, axis=-2, prepend=start)
+
+
+# -----------------------------
+# FILL CHECK (the only sequential part)
+# -----------------------------
+def _no_short(qty, held):
+    """
+    Fills if every buy went through: a sell needs the holding, which only depends on the
+    instrument's own earlier fills, so this runs day by day vectorized across instruments.
+    Returns (fills, holdings after each day).
+    """
+    by_day = np.ascontiguousarray(np.moveaxis(qty, -2, 0))  # contiguous rows per day
+    fills = np.empty_like(by_day)
+    held_path = np.empty_like(by_day)
+    held = np.array(held, dtype=np.float64)
+    for d, q in enumerate(by_day):
+        f = np.where((q > 0) | (held >= -q), q, 0.0)
+        held += f
+        fills[d] = f
+        held_path[d] = held
+    return np.moveaxis(fills, 0, -2), np.moveaxis(held_path, 0, -2)
+
+
+def _cash_ok(fills, prices, cash):
+    """Per day (and backtest): does the cash before every buy cover it, given these fills?"""
+    cost = fills * prices
+    flat = cost.reshape(cost.shape[:-2] + (-1,))
+    cash_before = (np.asarray(cash)[..., None] - (np.cumsum(flat, axis=-1) - flat)).reshape(cost.shape)
+    return ((fills <= 0) | (cash_before >= cost + TOLERANCE)).all(axis=-1)
+
+
+def _fill_day(qty, prices, cash, held):
+    """
+    Portfolio.buy / sell for one day's orders in instrument order. Sells only need the
+    holding, so they are decided at once; the loop runs over the buys, each seeing the
+    revenue of the sells before it. Returns (filled, cash, holdings).
+    """
+    sells = (qty < 0) & (held >= -qty)
+    earned = np.cumsum(np.where(sells, prices * -qty, 0.0))  # sell revenue up to each instrument
+    buys = np.flatnonzero(qty > 0)
+    bought = []
+    spent = 0.0
+    for k, cost, revenue in zip(buys.tolist(), (prices[buys] * qty[buys]).tolist(), earned[buys].tolist()):
+        if cash + revenue - spent >= cost:
+            spent += cost
+            bought.append(k)
+    filled = sells
+    filled[bought] = True
+    return filled, cash + earned[-1] - spent, held + np.where(filled, qty, 0.0)
+
+
+def _fill_path(qty, prices, cash, held):
+    """
+    Filled mask for one backtest: blocks of days where the cash never runs short are
+    accepted as a whole (the block doubles while that holds); the first day where it might
+    goes through the scalar loop, and so does every following day until one rejects no buy.
+    """
+    days = qty.shape[0]
+    filled = np.zeros(qty.shape, dtype=bool)
+    held = np.array(held, dtype=np.float64)
+    day, span = 0, 1
+    while day < days:
+        if span:
+            end = min(day + span, days)
+            fills, held_path = _no_short(qty[day:end], held)
+            ok = _cash_ok(fills, prices[day:end], cash)
+            good = int(np.argmin(ok)) if not ok.all() else end - day
+            if good:  # every buy of these days fits in the cash
+                filled[day:day + good] = fills[:good] != 0
+                cash -= (fills[:good] * prices[day:day + good]).sum()
+                held = held_path[good - 1].copy()
+            day += good
+            span *= 2
+            if day == end:
+                continue
+        # this day may reject a buy: check it exactly
+        filled[day], cash, held = _fill_day(qty[day], prices[day], cash, held)
+        span = 0 if ((qty[day] > 0) & ~filled[day]).any() else 1
+        day += 1
+    return filled
+
+
+def _step_orders(q_days, cost_days, cash, held):
+    """One step per (day, instrument) with an order, vectorized across the backtests."""
+    out = np.zeros(q_days.shape, dtype=bool)
+    for d, i in zip(*np.nonzero((q_days != 0).any(axis=2))):
+        q, cost = q_days[d, i], cost_days[d, i]
+        ok = np.where(q > 0, cash >= cost, held[i] >= -q) & (q != 0)
+        cash -= cost * ok
+        held[i] += q * ok
+        out[d, i] = ok
+    return out
+
+
+def _step_days(q_days, cost_days, cash, held):
+    """
+    One step per day, vectorized across instruments and backtests: sells at once, then every
+    buy is bounded from both sides:
+    - it fills for sure if the cash covers it even when every earlier buy of the day fills
+    - it is rejected for sure if the cash does not cover it even when only the sure ones fill
+    Only the buys left in between take a step per instrument, in instrument order.
+    """
+    out = np.empty(q_days.shape, dtype=bool)
+    for d, (q, cost) in enumerate(zip(q_days, cost_days)):
+        sells = (q < 0) & (held >= -q)
+        available = cash + np.cumsum(np.where(sells, -cost, 0.0), axis=0)  # cash + sell revenue so far
+        buys = q > 0
+        buy_cost = np.where(buys, cost, 0.0)
+        sure = buys & (available - (np.cumsum(buy_cost, axis=0) - buy_cost) >= buy_cost + TOLERANCE)
+        if not (sure == buys).all():
+            sure_cost = np.where(sure, cost, 0.0)
+            room = available - (np.cumsum(sure_cost, axis=0) - sure_cost) - buy_cost  # if no unsure buy fills
+            unsure = buys & ~sure & (room >= -TOLERANCE)
+            extra = np.zeros(len(cash))  # spent on unsure buys that filled
+            for i in np.flatnonzero(unsure.any(axis=1)):
+                take = unsure[i] & (room[i] >= extra)
+                extra += cost[i] * take
+                sure[i] |= take
+            buys = sure
+        day = sells | buys
+        out[d] = day
+        cash = available[-1] - np.where(buys, cost, 0.0).sum(axis=0)
+        held += np.where(day, q, 0.0)
+    return out
+
+
+def _fill_rows(qty, prices, cash, held, fills, held_path, ok):
+    """
+    Filled masks for many backtests, vectorized across them. fills / held_path / ok are the
+    no-short scan and its cash check, which are exact up to the first day where any of the
+    backtests may run short; only the days from there on are stepped through, on
+    (days, instruments, backtests) contiguous arrays: per order for a few instruments, per day
+    from DAY_STEP_INSTRUMENTS on.
+    """
+    n = qty.shape[-1]
+    filled = fills != 0
+    start = int(np.argmin(ok.all(axis=0)))  # these backtests do run short somewhere
+    cash = cash - (fills[:, :start] * prices[:, :start]).sum(axis=(1, 2))
+    held = np.ascontiguousarray((held_path[:, start - 1] if start else held).T)  # (n, rows)
+    q_days = np.ascontiguousarray(np.moveaxis(qty[:, start:], 0, -1))
+    cost_days = q_days * np.moveaxis(prices[:, start:], 0, -1)
+    step = _step_days if n >= DAY_STEP_INSTRUMENTS else _step_orders
+    filled[:, start:] = np.moveaxis(step(q_days, cost_days, cash, held), -1, 0)
+    return filled
+
+
+def fill_mask(prices, orders, cash, holdings=None):
+    """Which orders fill under the cash and no-short rules; same shape as the orders."""
+    prices = np.asarray(prices, dtype=np.float64)
+    shape = np.broadcast_shapes(prices.shape, np.shape(orders))
+    days, n = shape[-2:]
+    qty = np.broadcast_to(np.nan_to_num(np.asarray(orders, dtype=np.float64)), shape).reshape(-1, days, n)
+    prices = np.broadcast_to(prices, shape).reshape(-1, days, n)
+    rows = qty.shape[0]
+    cash = np.broadcast_to(np.asarray(cash, dtype=np.float64), shape[:-2]).reshape(rows)
+    held = np.zeros((rows, n)) if holdings is None else \
+        np.broadcast_to(np.asarray(holdings, dtype=np.float64), shape[:-2] + (n,)).reshape(rows, n)
+
+    # backtests whose cash never runs short are fully decided by the no-short scan
+    fills, held_path = _no_short(qty, held)
+    filled = fills != 0
+    ok = _cash_ok(fills, prices, cash)
+    check = np.flatnonzero(~ok.all(axis=-1))
+    if len(check) >= BATCH_ROWS:
+        filled[check] = _fill_rows(qty[check], prices[check], cash[check], held[check],
+                                   fills[check], held_path[check], ok[check])
+    else:
+        for r in check:
+            filled[r] = _fill_path(qty[r], prices[r], float(cash[r]), held[r])
+    return filled.reshape(shape)
+
+
+# -----------------------------
+# BACKTEST
+# -----------------------------
+def backtest(prices, orders, cash=10000.0, holdings=None):
+    """
+    Run the orders (shares per day and instrument, > 0 buy, < 0 sell) against the prices.
+    prices / orders: (..., days, instruments), broadcastable; cash: starting cash (per backtest);
+    holdings: starting shares per instrument.
+    Returns a dict of arrays: fills (executed signed shares), rejected (orders that did not
+    fill), holdings and cash after each day, equity = cash + holdings @ prices per day.
+    """
+    prices = np.asarray(prices, dtype=np.float64)
+    orders = np.nan_to_num(np.asarray(orders, dtype=np.float64))
+    filled = fill_mask(prices, orders, cash, holdings)
+    fills = np.where(filled, orders, 0.0)
+
+    start = 0.0 if holdings is None else np.asarray(holdings, dtype=np.float64)[..., None, :]
+    held = start + np.cumsum(fills, axis=-2)
+    cash_path = np.asarray(cash, dtype=np.float64)[..., None] - np.cumsum((fills * prices).sum(axis=-1), axis=-1)
+    equity = cash_path + (held * prices).sum(axis=-1)
+    return {"fills": fills, "rejected": (orders != 0) & ~filled, "holdings": held,
+            "cash": cash_path, "equity": equity}
+
+
+if __name__ == "__main__":
+    import time
+
+    # 10 years x 500 instruments, buy on drop / sell on rise, 10 shares per trade
+    rng = np.random.default_rng(0)
+    days, n = 2520, 500
+    prices = 100 * np.cumprod(1 + rng.uniform(-0.05, 0.05, (days, n)), axis=0)
+    change = np.diff(prices, axis=0, prepend=np.nan)
+    for cash in (1e9, 1e6):
+        t0 = time.perf_counter()
+        result = backtest(prices, signal_orders(-np.sign(change), 10), cash=cash)
+        print(f"cash {cash:.0e}: {days} days x {n} instruments in {(time.perf_counter() - t0) * 1000:.0f} ms, "
+              f"{int(result['rejected'].sum())} rejected, final equity {result['equity'][-1]:,.0f}")
@@ -0,0 +1,115 @@
+"""
+Monte Carlo mode for the trading simulator
+
+Instead of one random 30-day path drawn with random.uniform per stock per day,
+every model here draws a whole (paths x days x stocks) return tensor in one
+NumPy call:
+
+- "uniform": the Stock.simulate_day model, daily change uniform in [low, high)
+- "gbm": geometric Brownian motion with daily drift mu and volatility sigma
+- "bootstrap": whole days resampled from historical returns (keeps the
+  correlation between stocks)
+
+monte_carlo() turns the returns into price paths, computes the strategy features
+once (strategies.py), runs every strategy on all paths at once with the batched
+backtest, and summarizes the final P&L (mean, quantiles, VaR / CVaR) and the
+equity quantile bands per day.
+
+    result = monte_carlo(["Buy on Drop", "Buy on Rise"], start_prices=[150, 2800], days=30,
+                         paths=100_000, seed=0)
+    result["summary"]                          # one row per strategy
+    result["bands"]["Buy on Drop"]             # (quantiles, days) equity bands
+"""
+import numpy as np
+import pandas as pd
+
+from backtest import backtest
+from strategies import features, resolve_strategies
+
+QUANTILES = (0.05, 0.25, 0.5, 0.75, 0.95)
+VAR_LEVELS = (0.95, 0.99)
+
+
+# -----------------------------
+# RETURN MODELS
+# -----------------------------
+def uniform_returns(rng, paths, days, n, low=-0.05, high=0.05):
+    return rng.uniform(low, high, (paths, days, n))
+
+
+def gbm_returns(rng, paths, days, n, mu=0.0, sigma=0.02):
+    """Simple daily returns of a GBM; mu / sigma are daily and may be one value per stock."""
+    mu, sigma = np.asarray(mu, dtype=np.float64), np.asarray(sigma, dtype=np.float64)
+    return np.expm1(mu - sigma ** 2 / 2 + sigma * rng.standard_normal((paths, days, n)))
+
+
+def bootstrap_returns(rng, paths, days, n, history=None):
+    """Whole days drawn with replacement from `history`, a (days, n) array of past simple returns."""
+    history = np.asarray(history, dtype=np.float64)
+    history = history[~np.isnan(history).any(axis=1)]
+    if history.ndim != 2 or history.shape[1] != n or len(history) == 0:
+        raise ValueError(f"history must be a (days, {n}) array of returns without NaN rows")
+    return history[rng.integers(0, len(history), (paths, days))]
+
+
+MODELS = {"uniform": uniform_returns, "gbm": gbm_returns, "bootstrap": bootstrap_returns}
+
+
+def simulate_returns(model, paths, days, n, rng, **params):
+    if model not in MODELS:
+        raise ValueError(f"Unknown model {model!r}, expected one of {list(MODELS)}")
+    return MODELS[model](rng, paths, days, n, **params)
+
+
+def price_paths(start_prices, returns):
+    """(paths, days + 1, n) prices: day 0 is the start price, then compounded returns."""
+    start = np.asarray(start_prices, dtype=np.float64)
+    growth = np.cumprod(1 + returns, axis=-2)
+    return np.concatenate([np.broadcast_to(start, growth[..., :1, :].shape), start * growth], axis=-2)
+
+
+# -----------------------------
+# STATISTICS
+# -----------------------------
+def risk_stats(pnl, levels=VAR_LEVELS, quantiles=QUANTILES):
+    """Mean, std, loss probability, quantiles, and VaR / CVaR (as positive losses) of a P&L sample."""
+    pnl = np.asarray(pnl, dtype=np.float64)
+    stats = {"mean": pnl.mean(), "std": pnl.std(), "p_loss": (pnl < 0).mean()}
+    for q, v in zip(quantiles, np.quantile(pnl, quantiles)):
+        stats[f"q{q:g}"] = v
+    for level in levels:
+        cutoff = np.quantile(pnl, 1 - level)
+        stats[f"VaR{level:g}"] = -cutoff
+        stats[f"CVaR{level:g}"] = -pnl[pnl <= cutoff].mean()
+    return stats
+
+
+def quantile_bands(equity, quantiles=QUANTILES):
+    """(quantiles, days) equity quantiles across paths."""
+    return np.quantile(equity, quantiles, axis=0)
+
+
+# -----------------------------
+# MONTE CARLO
+# -----------------------------
+def monte_carlo(strategies, start_prices, days=30, paths=10000, model="uniform", seed=None, cash=10000.0,
+                quantiles=QUANTILES, levels=VAR_LEVELS, **params):
+    """
+    Run every strategy (registered names or {name: features -> orders}, see strategies.py) on
+    the same `paths` simulated price paths.
+    Returns a dict: summary (DataFrame, one row of risk_stats of the final P&L per strategy),
+    bands ({name: (quantiles, days + 1) equity bands}), pnl ({name: final P&L per path}) and
+    prices (the simulated paths).
+    """
+    rng = np.random.default_rng(seed)
+    n = len(np.atleast_1d(start_prices))
+    prices = price_paths(start_prices, simulate_returns(model, paths, days, n, rng, **params))
+    f = features(prices)
+    bands, pnl, rows = {}, {}, {}
+    for name, strategy in resolve_strategies(strategies).items():
+        equity = backtest(prices, strategy(f), cash=cash)["equity"]
+        pnl[name] = equity[:, -1] - cash
+        bands[name] = quantile_bands(equity, quantiles)
+        rows[name] = risk_stats(pnl[name], levels, quantiles)
+    return {"summary": pd.DataFrame.from_dict(rows, orient="index"), "bands": bands, "pnl": pnl,
+            "prices": prices}
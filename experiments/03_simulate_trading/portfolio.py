@@ -0,0 +1,293 @@
+"""
+Array-backed portfolio for the trading simulator
+
+Market interns instrument names to integer ids and keeps their current prices in
+one float64 array. ArrayPortfolio keeps the cash and a holdings array aligned
+with those ids, so
+
+- value() is one dot product: cash + holdings @ prices
+- buy_many(ids, amounts) / sell_many(ids, amounts) run whole batches of orders
+  with the rules of Portfolio.buy / sell: orders are taken in the given order, a
+  buy needs the cash left at that point, a sell needs the shares (no shorting).
+  A batch is checked optimistically with cumulative sums; only when an order may
+  be rejected does a scalar loop take over (buys: from that order on; sells: only
+  for the instruments concerned).
+
+Stock and Portfolio keep the interface of the classes the simulate_*.py scripts
+used to define. A Stock is self-contained; its price history is a growing array
+instead of a Python list (keep only the last `max_history` prices if given).
+Each Portfolio trades through its own Market and ArrayPortfolio, keyed by stock
+name like the original holdings dict, at the traded Stock's current price.
+
+    market = Market()
+    ids = market.add_many(names, prices)
+    book = ArrayPortfolio(10000, market)
+    filled = book.buy_many(ids, amounts)
+    book.value()
+"""
+import random
+
+import numpy as np
+
+TOLERANCE = 1e-9  # optimistic checks closer than this to the limit are re-checked exactly
+
+
+def _grow(array, size):
+    """array with room for at least `size` entries (capacity doubles, new entries are 0)."""
+    if size <= len(array):
+        return array
+    grown = np.zeros(max(size, 2 * len(array), 16), dtype=array.dtype)
+    grown[:len(array)] = array
+    return grown
+
+
+# -----------------------------
+# INSTRUMENTS
+# -----------------------------
+class Market:
+    """Instrument names interned to integer ids, with the current price of each."""
+    __slots__ = ("names", "ids", "_prices")
+
+    def __init__(self):
+        self.names = []
+        self.ids = {}
+        self._prices = np.zeros(0)
+
+    def __len__(self):
+        return len(self.names)
+
+    @property
+    def prices(self):
+        return self._prices[:len(self.names)]
+
+    def add(self, name, price=np.nan):
+        """Id of `name` (registered on first use); sets its price when one is given."""
+        i = self.ids.get(name)
+        if i is None:
+            i = self.ids[name] = len(self.names)
+            self.names.append(name)
+            self._prices = _grow(self._prices, i + 1)
+        if not np.isnan(price):
+            self._prices[i] = price
+        return i
+
+    def add_many(self, names, prices=None):
+        prices = np.full(len(names), np.nan) if prices is None else np.asarray(prices, dtype=np.float64)
+        return np.array([self.add(name, price) for name, price in zip(names, prices)], dtype=np.int64)
+
+    def id_of(self, names):
+        """Id (or int64 array of ids) of registered names."""
+        if isinstance(names, str):
+            return self.ids[names]
+        return np.array([self.ids[name] for name in names], dtype=np.int64)
+
+    def set_prices(self, ids, prices):
+        self._prices[np.asarray(ids)] = prices
+
+    def simulate_day(self, rng, low=-0.05, high=0.05):
+        """Stock.simulate_day for every instrument at once; returns the changes."""
+        change = rng.uniform(low, high, len(self))
+        self.prices[:] *= 1 + change
+        return change
+
+
+# -----------------------------
+# PORTFOLIO
+# -----------------------------
+class ArrayPortfolio:
+    """Cash plus a holdings array indexed by Market ids."""
+    __slots__ = ("cash", "market", "_holdings")
+
+    def __init__(self, cash, market):
+        self.cash = cash
+        self.market = market
+        self._holdings = np.zeros(len(market))
+
+    @property
+    def holdings(self):
+        """Shares per instrument id (grows with the market)."""
+        self._holdings = _grow(self._holdings, len(self.market))
+        return self._holdings[:len(self.market)]
+
+    def _orders(self, ids, amounts, prices):
+        ids = np.atleast_1d(np.asarray(ids, dtype=np.int64))
+        amounts = np.broadcast_to(np.asarray(amounts, dtype=np.float64), ids.shape)
+        prices = self.market.prices[ids] if prices is None else \
+            np.broadcast_to(np.asarray(prices, dtype=np.float64), ids.shape)
+        return ids, amounts, prices
+
+    def buy_many(self, ids, amounts, prices=None):
+        """
+        Buy amounts[k] shares of ids[k] in order, each only if the cash left covers it.
+        prices default to the market prices. Returns the filled mask.
+        """
+        ids, amounts, prices = self._orders(ids, amounts, prices)
+        cost = prices * amounts
+        holdings = self.holdings
+        # cash before order k covers it  <=>  cash >= cost of orders 0..k
+        fits = self.cash - np.cumsum(cost) >= TOLERANCE
+        first = len(ids) if fits.all() else int(np.argmin(fits))
+        filled = np.zeros(len(ids), dtype=bool)
+        filled[:first] = True
+        cash = self.cash - cost[:first].sum()
+        # from the first order that may be rejected: exact, one by one, until nothing fits any more
+        cheapest_left = np.minimum.accumulate(cost[first:][::-1])[::-1].tolist()
+        for k, c, cheapest in zip(range(first, len(ids)), cost[first:].tolist(), cheapest_left):
+            if cash < cheapest:
+                break
+            if cash >= c:
+                cash -= c
+                filled[k] = True
+        np.add.at(holdings, ids[filled], amounts[filled])
+        self.cash = cash
+        return filled
+
+    def sell_many(self, ids, amounts, prices=None):
+        """
+        Sell amounts[k] shares of ids[k] in order, each only if the holding covers it.
+        prices default to the market prices. Returns the filled mask.
+        """
+        ids, amounts, prices = self._orders(ids, amounts, prices)
+        holdings = self.holdings
+        # holding before each order if every earlier sell of the same instrument fills
+        order = np.argsort(ids, kind="stable")
+        sorted_ids, sorted_amounts = ids[order], amounts[order]
+        sizes = np.diff(np.r_[np.flatnonzero(np.r_[True, sorted_ids[1:] != sorted_ids[:-1]]), len(ids)])
+        sold = np.cumsum(sorted_amounts)
+        sold_before = sold - sorted_amounts - np.repeat((sold - sorted_amounts)[np.cumsum(sizes) - sizes], sizes)
+        bad = holdings[sorted_ids] - sold_before - sorted_amounts < TOLERANCE
+        # orders from the first one that may be rejected on, per instrument
+        bad_so_far = np.cumsum(bad)
+        unsure = bad_so_far - np.repeat((bad_so_far - bad)[np.cumsum(sizes) - sizes], sizes) > 0
+
+        filled = np.zeros(len(ids), dtype=bool)
+        filled[order[~unsure]] = True
+        np.subtract.at(holdings, ids[filled], amounts[filled])
+        # exact, one by one, in order, for those orders only
+        left = dict(zip(sorted_ids[unsure].tolist(), holdings[sorted_ids[unsure]].tolist()))
+        for k, i, a in zip(order[unsure].tolist(), sorted_ids[unsure].tolist(), sorted_amounts[unsure].tolist()):
+            if left[i] >= a:
+                left[i] -= a
+                filled[k] = True
+        holdings[list(left)] = list(left.values())
+        self.cash += (prices[filled] * amounts[filled]).sum()
+        return filled
+
+    def value(self, prices=None):
+        """cash + holdings @ prices (default: the market prices)."""
+        return self.cash + self.holdings @ (self.market.prices if prices is None else prices)
+
+
+# -----------------------------
+# COMPATIBILITY FACADE
+# -----------------------------
+class Stock:
+    """
+    Stock(name, price) of the simulate_*.py scripts; self-contained, history is a float64 array.
+    With max_history=n the last n prices live in a ring buffer stored twice (2n slots, every
+    price written at i and i + n), so a new bar is O(1) and history stays a contiguous view.
+    """
+    __slots__ = ("name", "price", "max_history", "_history", "_head", "_length")
+
+    def __init__(self, name, price, max_history=None):
+        self.name = name
+        self.price = price
+        self.max_history = max_history
+        self._history = np.zeros(2 * max_history if max_history else 16)
+        self._head = 0
+        self._length = 0
+        self._record(price)
+
+    @property
+    def history(self):
+        return self._history[self._head:self._head + self._length]
+
+    def _record(self, price):
+        n = self.max_history
+        if not n:
+            self._history = _grow(self._history, self._length + 1)
+            self._history[self._length] = price
+            self._length += 1
+            return
+        slot = (self._head + self._length) % n
+        self._history[slot] = self._history[slot + n] = price
+        if self._length < n:
+            self._length += 1
+        else:
+            self._head = (self._head + 1) % n
+
+    def simulate_day(self):
+        change_percent = random.uniform(-0.05, 0.05)
+        self.price *= (1 + change_percent)
+        self._record(self.price)
+
+
+class Portfolio:
+    """
+    Portfolio(cash) of the simulate_*.py scripts on top of an ArrayPortfolio with its own Market.
+    Holdings are keyed by stock name and every trade is priced at that Stock's current price.
+    """
+    __slots__ = ("book", "verbose")
+
+    def __init__(self, cash, stock_list=None, verbose=False):
+        self.book = ArrayPortfolio(cash, Market())
+        self.verbose = verbose
+        if stock_list:
+            self.book.market.add_many([stock.name for stock in stock_list], [stock.price for stock in stock_list])
+
+    @property
+    def cash(self):
+        return self.book.cash
+
+    @property
+    def holdings(self):
+        """{name: shares} of the instruments currently held."""
+        held = self.book.holdings
+        return {self.book.market.names[i]: held[i] for i in np.flatnonzero(held)}
+
+    def _id(self, stock):
+        """Id of the stock in this portfolio's market, priced at stock.price."""
+        return self.book.market.add(stock.name, stock.price)
+
+    def buy(self, stock, amount):
+        if self.book.buy_many([self._id(stock)], [amount])[0]:
+            if self.verbose:
+                print(f"Bought {amount} shares of {stock.name} at ${stock.price:.2f}")
+        elif self.verbose:
+            print("Not enough cash to buy.")
+
+    def sell(self, stock, amount):
+        if self.book.sell_many([self._id(stock)], [amount])[0]:
+            if self.verbose:
+                print(f"Sold {amount} shares of {stock.name} at ${stock.price:.2f}")
+        elif self.verbose:
+            print("Not enough shares to sell.")
+
+    def value(self, stock_list=None):
+        """Cash plus holdings at the prices of stock_list (default: the last traded prices)."""
+        if stock_list is None:
+            return self.book.value()
+        ids = self.book.market.ids
+        held = self.book.holdings
+        shares = np.array([held[ids[stock.name]] if stock.name in ids else 0.0 for stock in stock_list])
+        return self.cash + shares @ np.array([stock.price for stock in stock_list], dtype=np.float64)
+
+
+if __name__ == "__main__":
+    import time
+
+    # 5,000 instruments: buy 1,000,000 lots, mark to market, then sell them again in another order
+    rng = np.random.default_rng(0)
+    market = Market()
+    ids = market.add_many([f"T{i:04d}" for i in range(5000)], rng.uniform(10, 500, 5000))
+    book = ArrayPortfolio(5e9, market)
+    orders = rng.integers(0, 5000, 1_000_000)
+    amounts = rng.integers(1, 20, 1_000_000)
+    t0 = time.perf_counter()
+    bought = book.buy_many(orders, amounts)
+    market.simulate_day(rng)
+    value = book.value()
+    shuffle = rng.permutation(len(orders))
+    sold = book.sell_many(orders[shuffle], amounts[shuffle] + (shuffle % 100 == 0))  # 1% oversized
+    print(f"2 x 1,000,000 orders in {(time.perf_counter() - t0) * 1000:.0f} ms: {bought.sum()} bought, "
+          f"value {value:,.0f}, {sold.sum()} sold, cash {book.cash:,.0f}")
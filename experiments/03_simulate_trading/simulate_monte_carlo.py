@@ -0,0 +1,72 @@
+import os
+import sys
+
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from parallel_monte_carlo import parallel_monte_carlo
+
+# USER SETTINGS
+STOCKS = {"AAPL": 150, "GOOGL": 2800}
+DAYS = 30
+PATHS = 100_000
+MODEL = "uniform"  # "uniform", "gbm" or "bootstrap" (daily returns of the last 5 years)
+SEED = 0  # same seed -> identical results for any number of processes
+PROCESSES = os.cpu_count()
+INITIAL_CASH = 10000
+
+
+def model_params():
+    if MODEL == "gbm":
+        return {"mu": 0.0, "sigma": 0.03}
+    if MODEL == "bootstrap":
+        sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+        from ohlcv_cache import download
+        # one row per date every ticker traded on, so each resampled day is the same day for all
+        closes = pd.concat({t: download(t, period="5y", interval="1d")["Close"] for t in STOCKS},
+                           axis=1, join="inner").to_numpy(dtype=np.float64)
+        return {"history": closes[1:] / closes[:-1] - 1}
+    return {}
+
+
+def simulate_trading():
+    strategies = ["Buy on Drop", "Buy on Rise"]
+    result = parallel_monte_carlo(strategies, list(STOCKS.values()), days=DAYS, paths=PATHS, model=MODEL,
+                                  seed=SEED, cash=INITIAL_CASH, processes=PROCESSES, **model_params())
+    print(f"{PATHS} paths x {DAYS} days, model: {MODEL}, seed: {result['seed']}")
+    print(result["summary"].round(2).T)
+
+    plt.figure(figsize=(12, 5))
+
+    # Profit quantile bands per strategy
+    plt.subplot(1, 2, 1)
+    for (name, bands), color in zip(result["bands"].items(), ["blue", "green"]):
+        profit = bands - INITIAL_CASH
+        mid = len(profit) // 2
+        plt.plot(profit[mid], color=color, label=f"{name} (median)")
+        plt.fill_between(range(DAYS + 1), profit[0], profit[-1], color=color, alpha=0.15)
+        plt.fill_between(range(DAYS + 1), profit[1], profit[-2], color=color, alpha=0.25)
+    plt.title("Profit Bands (5-25-50-75-95%)")
+    plt.xlabel("Days")
+    plt.ylabel("Profit ($)")
+    plt.legend()
+    plt.grid(True)
+
+    # Final P&L distribution
+    plt.subplot(1, 2, 2)
+    for (name, pnl), color in zip(result["sketches"].items(), ["blue", "green"]):
+        plt.hist(pnl.bins * pnl.bin_width, bins=100, weights=pnl.counts, color=color, alpha=0.5, label=name)
+        plt.axvline(-result["summary"].loc[name, "VaR0.95"], color=color, linestyle="--",
+                    label=f"{name} 95% VaR")
+    plt.title(f"Final Profit Distribution ({PATHS} paths)")
+    plt.xlabel("Profit ($)")
+    plt.ylabel("Paths")
+    plt.legend()
+
+    plt.tight_layout()
+    plt.show()
+
+
+if __name__ == "__main__":  # the process pool re-imports this module on spawn platforms
+    simulate_trading()
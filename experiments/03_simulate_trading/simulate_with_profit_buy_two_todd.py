@@ -1,100 +1,27 @@
-import random
+import numpy as np
 
-import matplotlib.pyplot as plt
-
-
-class Stock:
-    def __init__(self, name, price):
-        self.name = name
-        self.price = price
-        self.history = [price]
-
-    def simulate_day(self):
-        change_percent = random.uniform(-0.05, 0.05)
-        self.price *= (1 + change_percent)
-        self.history.append(self.price)
-
-
-class Portfolio:
-    def __init__(self, cash):
-        self.cash = cash
-        self.holdings = {}
-
-    def buy(self, stock, amount):
-        cost = stock.price * amount
-        if self.cash >= cost:
-            self.cash -= cost
-            self.holdings[stock.name] = self.holdings.get(stock.name, 0) + amount
-            print(f"Bought {amount} shares of {stock.name} at ${stock.price:.2f}")
-        else:
-            print("Not enough cash to buy.")
-
-    def sell(self, stock, amount):
-        if self.holdings.get(stock.name, 0) >= amount:
-            self.holdings[stock.name] -= amount
-            revenue = stock.price * amount
-            self.cash += revenue
-            print(f"Sold {amount} shares of {stock.name} at ${stock.price:.2f}")
-        else:
-            print("Not enough shares to sell.")
-
-    def value(self, stock_list):
-        total = self.cash
-        for stock in stock_list:
-            total += self.holdings.get(stock.name, 0) * stock.price
-        return total
+from portfolio import Stock
+from strategies import evaluate, plot_comparison, print_trades
 
 
 def simulate_trading():
+    # Simulate stock prices once
     apple = Stock("AAPL", 150)
     google = Stock("GOOGL", 2800)
     stocks = [apple, google]
-    initial_cash = 10000
-    portfolio = Portfolio(initial_cash)
-    portfolio_values = []
 
-    for day in range(365):
-        print(f"\nDay {day + 1}")
+    for _ in range(365):
         for stock in stocks:
             stock.simulate_day()
-            print(f"{stock.name}: ${stock.price:.2f}")
-
-        # Simple strategy: buy if price dropped, sell if it rose
-        for stock in stocks:
-            if len(stock.history) > 1:
-                difference = abs(stock.price - stock.history[-2])
-                if stock.price < stock.history[-2]:
-                    portfolio.buy(stock, difference *2)  # Buy double the amount
-                elif stock.price > stock.history[-2]:
-                    portfolio.sell(stock, difference * 5)  # Sell double the amount
 
-        current_value = portfolio.value(stocks)
-        portfolio_values.append(current_value)
-        print(f"Portfolio value: ${current_value:.2f}")
-
-    # Calculate profit
-    profit = [value - initial_cash for value in portfolio_values]
-
-    # Plot stock prices
-    plt.figure(figsize=(12, 6))
-    plt.subplot(1, 2, 1)
-    for stock in stocks:
-        plt.plot(stock.history, label=stock.name)
-    plt.title("Stock Price Simulation")
-    plt.xlabel("Days")
-    plt.ylabel("Price")
-    plt.legend()
+    initial_cash = 10000
+    prices = np.column_stack([stock.history for stock in stocks])
 
-    # Plot profit
-    plt.subplot(1, 2, 2)
-    plt.plot(profit, color='green', label='Profit')
-    plt.title("Portfolio Profit Over Time")
-    plt.xlabel("Days")
-    plt.ylabel("Profit ($)")
-    plt.legend()
+    # Buy 2x the price drop in shares, sell 5x the price rise
+    result = evaluate(prices, ["Buy 2x Drop, Sell 5x Rise"], cash=initial_cash)
+    print_trades(prices, result, [stock.name for stock in stocks])
 
-    plt.tight_layout()
-    plt.show()
+    plot_comparison(prices, result["equity"], initial_cash, [stock.name for stock in stocks], "Portfolio Profit Over Time")
 
 
 simulate_trading()
@@ -0,0 +1,201 @@
+"""
+Strategy plugins for the trading simulator
+
+A strategy is a function features -> orders: it gets the features shared by all
+strategies (computed once per price path) and returns the shares to buy (> 0)
+or sell (< 0) per day and stock, as arrays. Register one with @strategy(name):
+
+    @strategy("Buy on Drop")
+    def buy_on_drop(f):
+        return signal_orders(-f["direction"])
+
+Features (arrays shaped like the prices, day 0 has no change):
+
+- prices, change (price - previous price), returns (change / previous price)
+- direction (+1 rise, -1 drop, 0 flat or day 0)
+- trade_amount: int(|returns| * scaling_factor), the simulate_with_weights sizing
+
+evaluate() stacks the orders of N strategies into one (N, days, stocks) batch
+and runs them through a single batched backtest, so every extra strategy adds
+one row to the arrays instead of another loop over days.
+
+    result = evaluate(prices, ["Buy on Drop", "Buy on Rise"], cash=10000)
+    result["summary"]     # final value, profit, return, max drawdown, trades, rejected
+    result["equity"]      # equity curves, one column per strategy
+"""
+import matplotlib.pyplot as plt
+import numpy as np
+import pandas as pd
+
+from backtest import backtest, signal_orders
+
+STRATEGIES = {}
+
+
+def strategy(name):
+    """Decorator registering a features -> orders function under `name`."""
+    def register(fn):
+        STRATEGIES[name] = fn
+        return fn
+    return register
+
+
+# -----------------------------
+# FEATURES
+# -----------------------------
+def features(prices, scaling_factor=200):
+    """Shared inputs of every strategy; prices: (..., days, stocks)."""
+    prices = np.asarray(prices, dtype=np.float64)
+    change = np.full(prices.shape, np.nan)
+    change[..., 1:, :] = np.diff(prices, axis=-2)
+    returns = np.full(prices.shape, np.nan)
+    returns[..., 1:, :] = change[..., 1:, :] / prices[..., :-1, :]
+    return {"prices": prices, "change": change, "returns": returns,
+            "direction": np.nan_to_num(np.sign(change)),
+            "trade_amount": np.nan_to_num(np.abs(returns) * scaling_factor).astype(int)}
+
+
+# -----------------------------
+# BUILT-IN STRATEGIES
+# -----------------------------
+@strategy("Buy on Drop")
+def buy_on_drop(f):
+    """Buy 1 share when the price dropped, sell 1 when it rose."""
+    return signal_orders(-f["direction"])
+
+
+@strategy("Buy on Rise")
+def buy_on_rise(f):
+    """Buy 1 share when the price rose, sell 1 when it dropped."""
+    return signal_orders(f["direction"])
+
+
+@strategy("Weighted Buy on Drop")
+def weighted_buy_on_drop(f):
+    """Buy on drop / sell on rise, trade_amount shares."""
+    return signal_orders(-f["direction"], f["trade_amount"])
+
+
+@strategy("Weighted Buy on Rise")
+def weighted_buy_on_rise(f):
+    """Buy on rise / sell on drop, trade_amount shares."""
+    return signal_orders(f["direction"], f["trade_amount"])
+
+
+@strategy("Buy 2x Drop, Sell 5x Rise")
+def buy_two_sell_five(f):
+    """Buy 2x the price drop in shares, sell 5x the price rise."""
+    size = np.nan_to_num(np.abs(f["change"]))
+    return np.where(f["direction"] < 0, 2 * size, -5 * size) * (f["direction"] != 0)
+
+
+# -----------------------------
+# EVALUATION
+# -----------------------------
+def resolve_strategies(strategies):
+    """Registered names, a {name: fn} dict or None (all registered) -> {name: fn}."""
+    if strategies is None:
+        return dict(STRATEGIES)
+    if isinstance(strategies, dict):
+        return strategies
+    unknown = [name for name in strategies if name not in STRATEGIES]
+    if unknown:
+        raise ValueError(f"Unknown strategies: {unknown}, registered: {list(STRATEGIES)}")
+    return {name: STRATEGIES[name] for name in strategies}
+
+
+def max_drawdown(equity):
+    """Largest drop from a running peak along the last axis."""
+    return (np.maximum.accumulate(equity, axis=-1) - equity).max(axis=-1)
+
+
+def evaluate(prices, strategies=None, cash=10000.0, scaling_factor=200):
+    """
+    Run strategies (registered names, a {name: fn} dict, or None for all registered ones) on
+    one (days, stocks) price path in a single batched backtest.
+    Returns a dict: summary (DataFrame, one row per strategy), equity (DataFrame, days x
+    strategies) and the backtest arrays (orders, fills, rejected, holdings, cash) with a
+    leading strategy axis.
+    """
+    strategies = resolve_strategies(strategies)
+    f = features(prices, scaling_factor)
+    orders = np.stack([np.broadcast_to(fn(f), f["prices"].shape) for fn in strategies.values()])
+    result = backtest(f["prices"], orders, cash=cash)
+    result["orders"] = orders
+
+    equity = result["equity"]
+    names = list(strategies)
+    result["summary"] = pd.DataFrame({
+        "final_value": equity[:, -1],
+        "profit": equity[:, -1] - cash,
+        "return_pct": (equity[:, -1] / cash - 1) * 100,
+        "max_drawdown": max_drawdown(equity),
+        "trades": (result["fills"] != 0).sum(axis=(1, 2)),
+        "rejected": result["rejected"].sum(axis=(1, 2)),
+    }, index=pd.Index(names, name="strategy"))
+    result["equity"] = pd.DataFrame(equity.T, columns=names)
+    return result
+
+
+def print_trades(prices, result, names, strategy=0):
+    """Day-by-day log of one strategy, as the original scripts printed it: prices, trades, value."""
+    prices = np.asarray(prices)
+    orders, fills = result["orders"][strategy], result["fills"][strategy]
+    equity = result["equity"].iloc[:, strategy].to_numpy()
+    for day in range(1, len(prices)):
+        print(f"\nDay {day}")
+        for name, price in zip(names, prices[day]):
+            print(f"{name}: ${price:.2f}")
+        for name, price, order, fill in zip(names, prices[day], orders[day], fills[day]):
+            amount = abs(order)
+            amount = int(amount) if amount == int(amount) else float(amount)
+            if fill > 0:
+                print(f"Bought {amount} shares of {name} at ${price:.2f}")
+            elif fill < 0:
+                print(f"Sold {amount} shares of {name} at ${price:.2f}")
+            elif order > 0:
+                print("Not enough cash to buy.")
+            elif order < 0:
+                print("Not enough shares to sell.")
+        print(f"Portfolio value: ${equity[day]:.2f}")
+
+
+def plot_comparison(prices, equity, cash, names, title="Profit Comparison"):
+    """Stock prices next to the profit curve of every strategy."""
+    plt.figure(figsize=(12, 5))
+    plt.subplot(1, 2, 1)
+    for column, name in zip(np.asarray(prices).T, names):
+        plt.plot(column, label=name)
+    plt.title("Stock Price Simulation")
+    plt.xlabel("Days")
+    plt.ylabel("Price")
+    plt.legend()
+
+    plt.subplot(1, 2, 2)
+    for strategy_name in equity.columns:
+        plt.plot(equity[strategy_name] - cash, label=strategy_name)
+    plt.title(title)
+    plt.xlabel("Days")
+    plt.ylabel("Profit ($)")
+    plt.legend()
+    plt.grid(True)
+
+    plt.tight_layout()
+    plt.show()
+
+
+if __name__ == "__main__":
+    import time
+
+    # 50 strategies (sized buy-on-drop / buy-on-rise variants) on 1 year x 20 stocks
+    rng = np.random.default_rng(0)
+    prices = 100 * np.cumprod(1 + rng.uniform(-0.05, 0.05, (252, 20)), axis=0)
+    variants = {}
+    for k in range(25):
+        variants[f"Drop x{k + 1}"] = lambda f, k=k: signal_orders(-f["direction"], k + 1)
+        variants[f"Rise x{k + 1}"] = lambda f, k=k: signal_orders(f["direction"], k + 1)
+    for n in (1, 10, 50):
+        t0 = time.perf_counter()
+        result = evaluate(prices, dict(list(variants.items())[:n]), cash=100_000)
+        print(f"{n:2d} strategies: {(time.perf_counter() - t0) * 1000:.0f} ms")
+    print(result["summary"].sort_values("profit", ascending=False).head(10).round(2))
@@ -3,15 +3,22 @@ import warnings
 warnings.filterwarnings("ignore")
 
 import os
+import sys
 import datetime as dt
 import numpy as np
-import yfinance as yf
+import pandas as pd
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.preprocessing import StandardScaler
 from sklearn.metrics import mean_absolute_error, mean_squared_error, r2_score
 import matplotlib.pyplot as plt
 import joblib
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from indicators import compute_indicators
+from normalize import normalize_ohlcv
+from ohlcv_cache import download
+from fractals import rolling_fractal_dimension, typical_box_height
+
 # USER SETTINGS
 TICKER = "GWRE"
 HISTORY_YEARS = 15  # use more historical data (set to e.g. 15 years)
@@ -21,6 +28,8 @@ RANDOM_STATE = 42
 MODEL_PATH = "gwre_model.joblib"
 SCALER_PATH = "gwre_scaler.joblib"
 PLOT_PATH = "gwre_predictions.png"
+FD_WINDOW = 64  # bars per rolling fractal-dimension window
+FD_STEP = 1  # bars between window updates (values are carried forward in between)
 
 
 def start_date_from_years(years):
@@ -33,63 +42,33 @@ END = None  # up to today
 
 
 def download_data(ticker, start, end):
-    df = yf.download(ticker, start=start, end=end, progress=False)
+    df = download(ticker, start=start, end=end)
     if df.empty:
         raise RuntimeError(f"No data for {ticker} in range {start}..{end}")
     return df
 
 
-def compute_rsi(series, period=14):
-    delta = series.diff()
-    gain = delta.clip(lower=0)
-    loss = -delta.clip(upper=0)
-    avg_gain = gain.ewm(alpha=1 / period, adjust=False).mean()
-    avg_loss = loss.ewm(alpha=1 / period, adjust=False).mean()
-    rs = avg_gain / (avg_loss + 1e-12)
-    rsi = 100 - (100 / (1 + rs))
-    return rsi
-
-
-def create_features(df, lags=30):
-    df = df.copy()
-    # ensure common column names are strings
-    df.columns = [str(c) for c in df.columns]
-    # detect close-like column
-    close_col = next((c for c in df.columns if "close" in c.lower()), None)
-    if close_col is None:
-        raise RuntimeError(f"No close-like column found. Columns: {list(df.columns)[:20]}")
-
-    # basic features
-    df["Return"] = df[close_col].pct_change()
-    df["MA5"] = df[close_col].rolling(5).mean()
-    df["MA10"] = df[close_col].rolling(10).mean()
-    df["MA20"] = df[close_col].rolling(20).mean()
-
-    # EMA and MACD
-    df["EMA12"] = df[close_col].ewm(span=12, adjust=False).mean()
-    df["EMA26"] = df[close_col].ewm(span=26, adjust=False).mean()
-    df["MACD"] = df["EMA12"] - df["EMA26"]
-
-    # RSI
-    df["RSI14"] = compute_rsi(df[close_col], period=14)
-
-    # Bollinger Bands (20,2)
-    ma20 = df[close_col].rolling(20).mean()
-    std20 = df[close_col].rolling(20).std()
-    df["BB_upper"] = ma20 + 2 * std20
-    df["BB_lower"] = ma20 - 2 * std20
-    df["BB_width"] = (df["BB_upper"] - df["BB_lower"]) / (ma20 + 1e-12)
-
-    # Volatility
-    df["Volatility_5"] = df["Return"].rolling(5).std()
-
-    # Lag features for close
-    for lag in range(1, lags + 1):
-        df[f"lag_{lag}"] = df[close_col].shift(lag)
-
-    # Target: next-day close
-    df["target"] = df[close_col].shift(-1)
+FEATURES = ["Return", "MA5", "MA10", "MA20", "EMA12", "EMA26", "MACD", "RSI14",
+            "BB_upper", "BB_lower", "BB_width", "Volatility_5"]
+
+
+def create_features(df, lags=30, box_height=None):
+    # canonical OHLCV columns (returns a new frame, the caller's df is untouched)
+    df = normalize_ohlcv(df)
+
+    # indicators, lag features and the next-day close target in one planned pass
+    # (shared rolling sums / EMAs are computed once, see common/indicators.py).
+    # The cached prices are float32 (normalize_ohlcv), not the float64 yfinance data the
+    # model was first tuned on; float64 output only avoids rounding the features again
+    names = FEATURES + [f"lag_{lag}" for lag in range(1, lags + 1)] + ["lead_1"]
+    features = pd.DataFrame(compute_indicators(df, names, dtype=np.float64), index=df.index,
+                            columns=names[:-1] + ["target"])
+    # rolling box-counting dimension of the close (neighbouring windows share box counts);
+    # box_height fixes the grid scale, main() takes it from the training bars only
+    fd = rolling_fractal_dimension(df["Close"].values, window=FD_WINDOW, step=FD_STEP, box_height=box_height)
+    features[f"FD_{FD_WINDOW}"] = pd.Series(fd, index=df.index).ffill()
 
+    df = pd.concat([df, features], axis=1)
     df = df.dropna()
     return df
 
@@ -161,12 +140,15 @@ def plot_results(test_df, preds, save_path):
 
 def main():
     df = download_data(TICKER, START, END)
-    df = create_features(df, lags=LAGS)
+    # fractal grid scale from bars that all end up in the training set (no look-ahead into the test set)
+    box_height = typical_box_height(df["Close"].values[:int(len(df) * (1 - TEST_RATIO))], FD_WINDOW)
+    df = create_features(df, lags=LAGS, box_height=box_height)
 
     # select features present in df
     desired = [f"lag_{i}" for i in range(1, LAGS + 1)] + ["MA5", "MA10", "MA20",
                                                           "Volatility_5", "EMA12", "EMA26",
-                                                          "MACD", "RSI14", "BB_width", "Return"]
+                                                          "MACD", "RSI14", "BB_width", "Return",
+                                                          f"FD_{FD_WINDOW}"]
     feature_cols = [c for c in desired if c in df.columns]
     if not feature_cols:
         raise RuntimeError("No feature columns found after feature creation.")
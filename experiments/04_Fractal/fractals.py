@@ -0,0 +1,316 @@
+"""
+Fractal tools shared by the 04_Fractal scripts
+
+find_fractals() detects Williams fractals with sliding-window views instead of
+a Python loop over bars. Any odd window width works (5 is the classic one),
+comparisons can be strict (the middle bar must beat every neighbour) or
+non-strict (ties allowed), and the inputs can be a single series or a
+(n_tickers, n_bars) panel.
+
+box_counting_dimension() quantizes the normalized series to integer cells once
+and counts the boxes touched by the price line (points and the segments between
+them) at every dyadic scale from per-column row extents: no dense grids and no
+per-scale pass over the data. rolling_fractal_dimension() does the same on a
+fixed grid for every window of a long history, sharing box counts between
+neighbouring windows.
+"""
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+
+# -----------------------------
+# FRACTAL DETECTION
+# -----------------------------
+def fractal_masks(highs, lows, width=5, strict=True):
+    """
+    Boolean (bullish, bearish) masks with the same shape as the inputs (last axis = bars).
+    Bearish: the middle high is the highest of `width` bars; bullish: the middle low is the lowest.
+    Bars closer than width // 2 to either end, or whose window contains NaN, are never fractals.
+    """
+    if width < 3 or width % 2 == 0:
+        raise ValueError(f"width must be an odd number >= 3, got {width}")
+    highs = np.asarray(highs, dtype=np.float64)
+    lows = np.asarray(lows, dtype=np.float64)
+    bullish = np.zeros(lows.shape, dtype=bool)
+    bearish = np.zeros(highs.shape, dtype=bool)
+    k = width // 2
+    if highs.shape[-1] < width:
+        return bullish, bearish
+
+    hw = sliding_window_view(highs, width, axis=-1)
+    lw = sliding_window_view(lows, width, axis=-1)
+    # fold the neighbour columns of the window one at a time: contiguous element-wise
+    # max/min is much faster than reducing over the strided window axis.
+    # NaN propagates through np.maximum/np.minimum so windows containing NaN fail
+    h_others, l_others = hw[..., 0].copy(), lw[..., 0].copy()
+    for j in range(1, width):
+        if j != k:
+            np.maximum(h_others, hw[..., j], out=h_others)
+            np.minimum(l_others, lw[..., j], out=l_others)
+    h_mid, l_mid = hw[..., k], lw[..., k]
+
+    with np.errstate(invalid="ignore"):
+        if strict:
+            bearish[..., k:-k] = h_mid > h_others
+            bullish[..., k:-k] = l_mid < l_others
+        else:
+            bearish[..., k:-k] = h_mid >= h_others
+            bullish[..., k:-k] = l_mid <= l_others
+    return bullish, bearish
+
+
+def find_fractals(df, width=5, strict=True):
+    """
+    (bullish, bearish) bar positions for a single-ticker DataFrame with High/Low columns.
+    Same result as the original 5-bar loop for width=5, strict=True.
+    """
+    bullish, bearish = fractal_masks(df['High'].values, df['Low'].values, width, strict)
+    return np.flatnonzero(bullish), np.flatnonzero(bearish)
+
+
+def find_fractals_panel(highs, lows, width=5, strict=True):
+    """
+    Fractals for (n_tickers, n_bars) arrays as compact index arrays:
+    ((bull_ticker, bull_bar), (bear_ticker, bear_bar)), all int32.
+    """
+    bullish, bearish = fractal_masks(highs, lows, width, strict)
+    bull = tuple(i.astype(np.int32) for i in np.nonzero(bullish))
+    bear = tuple(i.astype(np.int32) for i in np.nonzero(bearish))
+    return bull, bear
+
+
+# -----------------------------
+# BOX-COUNTING DIMENSION
+# -----------------------------
+def _ffill(y):
+    """Carry the last finite value over NaN / inf gaps (leading gaps stay NaN)."""
+    finite = np.isfinite(y)
+    if finite.all():
+        return y
+    filled = np.where(finite, y, np.nan)
+    last = np.maximum.accumulate(np.where(finite, np.arange(len(y)), 0))
+    return filled[last]
+
+
+def column_extents(y, x=None, levels=7):
+    """
+    Occupied cells of the price polyline on the finest 2**levels grid, one column at a time.
+
+    The series is normalized to the unit square and quantized to integer cells once.
+    A NaN price holds the last finite one, so a gap draws a flat line followed by a jump
+    instead of breaking the polyline. Because x (time) never decreases, the polyline inside
+    any column is then connected, so the cells it touches there are one contiguous run
+    lo..hi: the extremes of the points in that column and of the segments crossing its
+    left and right edges.
+    Returns (lo, hi) int64 arrays of length 2 * 2**levels in finest-grid rows (hi = -1: empty).
+    """
+    y = np.asarray(y, dtype=np.float64)
+    x = np.linspace(0, 1, len(y)) if x is None else np.asarray(x, dtype=np.float64)
+    keep = np.isfinite(x)
+    if not keep.all():
+        x, y = x[keep], y[keep]
+    y = _ffill(y)
+    keep = np.isfinite(y)  # only bars before the first price are left
+    if not keep.all():
+        x, y = x[keep], y[keep]
+    scale = 1 << levels
+    lo = np.full(2 * scale, np.iinfo(np.int64).max)
+    hi = np.full(2 * scale, -1, dtype=np.int64)
+    if len(y) == 0:
+        return lo, hi
+
+    x_span, y_span = x[-1] - x[0], y.max() - y.min()
+    fx = (x - x[0]) / x_span * scale if x_span > 0 else np.zeros_like(x)
+    fy = (y - y.min()) / y_span * scale if y_span > 0 else np.zeros_like(y)
+    ix, iy = fx.astype(np.int64), fy.astype(np.int64)  # truncation == floor, both are >= 0
+    steps = np.diff(ix)
+    if np.any(steps < 0):
+        raise ValueError("x must be non-decreasing")
+
+    # points: min/max row per column
+    starts = np.concatenate([[0], np.flatnonzero(steps) + 1])
+    cols = ix[starts]
+    lo[cols] = np.minimum.reduceat(iy, starts)
+    hi[cols] = np.maximum.reduceat(iy, starts)
+
+    # column edges crossed between consecutive points (each edge is crossed at most once)
+    seg = np.repeat(np.arange(len(steps)), steps)
+    edge = ix[seg] + 1 + np.arange(len(seg)) - np.repeat(np.cumsum(steps) - steps, steps)
+    t = (edge - fx[seg]) / (fx[seg + 1] - fx[seg])
+    y_edge = fy[seg] + t * (fy[seg + 1] - fy[seg])
+    # the crossing point belongs to the column right of the edge; the column left of it only
+    # reaches the row the segment is in just before the edge (matters on exact grid lines)
+    rising = fy[seg + 1] > fy[seg]
+    right_row = np.floor(y_edge).astype(np.int64)
+    left_row = np.where(rising, np.ceil(y_edge) - 1, np.floor(y_edge)).astype(np.int64)
+    row_lo, row_hi = np.minimum(iy[seg], iy[seg + 1]), np.maximum(iy[seg], iy[seg + 1])
+    for c, row in ((edge - 1, left_row), (edge, right_row)):
+        row = np.clip(row, row_lo, row_hi)
+        lo[c] = np.minimum(lo[c], row)
+        hi[c] = np.maximum(hi[c], row)
+    return lo, hi
+
+
+def box_counts(y, x=None, levels=7):
+    """Occupied boxes of size 1/2, 1/4, ..., 1/2**levels in one pass over the data."""
+    lo, hi = column_extents(y, x, levels)
+    counts = np.zeros(levels, dtype=np.int64)
+    # coarser grids: merge column pairs and drop low bits of the row numbers
+    for k in range(levels, 0, -1):
+        shift = levels - k
+        occupied = hi >= 0
+        counts[k - 1] = ((hi[occupied] >> shift) - (lo[occupied] >> shift) + 1).sum()
+        lo, hi = lo.reshape(-1, 2).min(axis=1), hi.reshape(-1, 2).max(axis=1)
+    return counts
+
+
+def fit_dimension(counts):
+    """Least-squares slope of log(count) against log(1/size) for sizes 1/2 ... 1/2**len(counts)."""
+    log_sizes = np.arange(1, len(counts) + 1) * np.log(2)
+    log_counts = np.log(counts)
+    slope, intercept = np.polyfit(log_sizes, log_counts, 1)
+    return {
+        "dimension": slope,
+        "intercept": intercept,
+        "sizes": 0.5 ** np.arange(1, len(counts) + 1),
+        "counts": counts,
+        "residuals": log_counts - (slope * log_sizes + intercept),
+    }
+
+
+def box_counting_dimension(y, x=None, levels=7):
+    """
+    Box-counting dimension of a price series (x defaults to evenly spaced bars).
+    Returns a dict with the dimension, fit intercept, box sizes, counts and fit residuals.
+    """
+    return fit_dimension(box_counts(y, x, levels))
+
+
+# -----------------------------
+# ROLLING FRACTAL DIMENSION
+# -----------------------------
+def _rolling_extreme(x, window, fn):
+    """fn (np.fmax / np.fmin) over x[i:i + window] for every start i, in O(n log window)."""
+    out, span = x, 1
+    while span * 2 <= window:  # doubling: out[i] covers x[i:i + span]
+        out = fn(out[:-span], out[span:])
+        span *= 2
+    return fn(out[:len(x) - window + 1], out[window - span:])
+
+
+EMPTY_LO, EMPTY_HI = np.iinfo(np.int64).max, np.iinfo(np.int64).min  # rows of a bar without a price
+
+
+def _segmented_extents(lo, hi, width):
+    """Per-column running min/max of the rows from the left (prefix) and from the right (suffix)."""
+    pad = -len(lo) % width
+    lo = np.concatenate([lo, np.full(pad, EMPTY_LO)]).reshape(-1, width)
+    hi = np.concatenate([hi, np.full(pad, EMPTY_HI)]).reshape(-1, width)
+    prefix = np.minimum.accumulate(lo, axis=1), np.maximum.accumulate(hi, axis=1)
+    suffix = (np.minimum.accumulate(lo[:, ::-1], axis=1)[:, ::-1],
+              np.maximum.accumulate(hi[:, ::-1], axis=1)[:, ::-1])
+    return prefix, suffix
+
+
+def _run_count(lo, hi):
+    return np.where(hi >= lo, hi - lo + 1, 0)
+
+
+def typical_box_height(close, window, levels=5):
+    """
+    Median log-price range of the windows of `close` / 2**levels, so a typical window spans
+    2**levels rows. Compute it on training bars only and pass it as box_height.
+    """
+    z = np.log(np.asarray(close, dtype=np.float64))
+    if len(z) < window:
+        raise ValueError(f"need at least one window of {window} bars")
+    spans = _rolling_extreme(z, window, np.fmax) - _rolling_extreme(z, window, np.fmin)
+    box_height = np.nanmedian(spans) / 2 ** levels
+    return box_height if box_height > 0 else 1.0
+
+
+def rolling_box_counts(close, window, step=1, levels=5, box_height=None):
+    """
+    Box counts for every window of `window` bars, moving `step` bars at a time.
+
+    Unlike box_counting_dimension() the grid is fixed for the whole history, so that
+    neighbouring windows can share their box-occupancy counts:
+    - columns are blocks of window // 2**levels bars at the finest scale (twice as wide
+      at every coarser one), rows are `box_height` in log price counted from the first
+      close. The default box_height is the range of the first window / 2**levels; pass
+      typical_box_height() of the training bars for a steadier scale. Either way the grid
+      only depends on bars up to the first window, so no window sees later bars
+    - every bar touches the rows between the previous close and its own close in its column;
+      consecutive bars chain, so a column's occupied rows are one run from min to max.
+      A NaN close holds the last finite close (a gap is flat, the bar after it jumps from
+      there), which keeps the chain unbroken; bars before the first close touch nothing
+    - the count of a window is the sum over the columns it covers. Moving the window adds the
+      columns entering on the right and removes the ones leaving on the left (a difference of
+      running totals); only the partial columns at both edges are looked up separately,
+      from per-column running min/max. Each window costs O(levels) after one O(n * levels) pass
+
+    Returns (ends, counts): the last bar of each window and an (n_windows, levels) array,
+    column k - 1 holding the count for boxes 1 / 2**k of the window.
+    """
+    z = _ffill(np.log(np.asarray(close, dtype=np.float64)))
+    n = len(z)
+    if window < 2 ** levels:
+        raise ValueError(f"window must hold at least 2**levels = {2 ** levels} bars")
+    starts = np.arange(0, n - window + 1, step)
+    if len(starts) == 0:
+        return starts, np.zeros((0, levels), dtype=np.int64)
+
+    if box_height is None:
+        box_height = (np.nanmax(z[:window]) - np.nanmin(z[:window])) / 2 ** levels
+        if not box_height > 0:
+            box_height = 1.0
+    finite = np.flatnonzero(np.isfinite(z))
+    rows = np.floor((z - (z[finite[0]] if len(finite) else 0.0)) / box_height)
+    prev = np.concatenate([rows[:1], rows[:-1]])
+    empty = np.isnan(rows)
+    with np.errstate(invalid="ignore"):
+        run_lo = np.nan_to_num(np.fmin(prev, rows)).astype(np.int64)
+        run_hi = np.nan_to_num(np.fmax(prev, rows)).astype(np.int64)
+    lo = np.where(empty, EMPTY_LO, run_lo)
+    hi = np.where(empty, EMPTY_HI, run_hi)
+
+    ends = starts + window
+    counts = np.zeros((len(starts), levels), dtype=np.int64)
+    base = max(1, window // 2 ** levels)
+    for k in range(levels, 0, -1):
+        shift = levels - k
+        width = base << shift
+        lo_k, hi_k = lo >> shift, hi >> shift  # empty stays empty (lo > hi)
+        (pre_lo, pre_hi), (suf_lo, suf_hi) = _segmented_extents(lo_k, hi_k, width)
+        totals = np.concatenate([[0], np.cumsum(_run_count(pre_lo[:, -1], pre_hi[:, -1]))])
+
+        first_full = -(-starts // width)  # columns entirely inside the window
+        last_full = ends // width
+        count = totals[last_full] - totals[first_full]
+        # partial column at the left edge: its suffix from the window start
+        left = starts % width != 0
+        col, off = starts[left] // width, starts[left] % width
+        count[left] += _run_count(suf_lo[col, off], suf_hi[col, off])
+        # partial column at the right edge: its prefix up to the window end
+        right = ends % width != 0
+        col, off = ends[right] // width, ends[right] % width - 1
+        count[right] += _run_count(pre_lo[col, off], pre_hi[col, off])
+        counts[:, k - 1] = count
+    return ends - 1, counts
+
+
+def rolling_fractal_dimension(close, window=64, step=1, levels=5, box_height=None):
+    """
+    Rolling box-counting dimension of a close series, aligned on each window's last bar
+    (NaN before the first full window and between steps). See rolling_box_counts().
+    """
+    values = np.full(len(close), np.nan)
+    ends, counts = rolling_box_counts(close, window, step, levels, box_height)
+    if len(ends) == 0:
+        return values
+    # least-squares slope of log(count) on log(1 / size) for all windows at once
+    log_sizes = np.arange(1, levels + 1) * np.log(2)
+    log_sizes -= log_sizes.mean()
+    log_counts = np.log(np.maximum(counts, 1))
+    values[ends] = (log_counts - log_counts.mean(axis=1, keepdims=True)) @ log_sizes / (log_sizes @ log_sizes)
+    return values
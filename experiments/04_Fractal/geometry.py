@@ -0,0 +1,89 @@
+"""
+Array-based fractal geometry for the demo scripts
+
+The generators build one whole level at a time instead of recursing per branch:
+
+- tree_segments(): every branch of a binary tree as one (n, 2, 2) segment array
+- sierpinski_triangles(): every filled triangle as one (3**depth, 3, 2) polygon array
+- koch_snowflake(): the closed Koch curve as one (3 * 4**order + 1, 2) point array
+
+add_lines() / add_polygons() draw such arrays as a single LineCollection /
+PolyCollection, so matplotlib handles one artist instead of one per branch.
+"""
+import numpy as np
+from matplotlib.collections import LineCollection, PolyCollection
+
+
+# -----------------------------
+# GENERATORS
+# -----------------------------
+def tree_segments(depth, length=100.0, angle=np.pi / 2, branch_angle=np.pi / 6, shrink=0.7,
+                  origin=(0.0, 0.0)):
+    """
+    Branches of a binary tree, level by level (2**depth - 1 segments).
+    Returns (segments (n, 2, 2), remaining depth of each branch), trunk first.
+    """
+    starts = np.array([origin], dtype=np.float64)
+    angles = np.array([angle], dtype=np.float64)
+    segments, levels = [], []
+    for level in range(depth):
+        ends = starts + length * np.column_stack([np.cos(angles), np.sin(angles)])
+        segments.append(np.stack([starts, ends], axis=1))
+        levels.append(np.full(len(starts), depth - level))
+        # every branch end splits into a left (+) and right (-) branch
+        starts = np.repeat(ends, 2, axis=0)
+        angles = (angles[:, None] + np.array([branch_angle, -branch_angle])).ravel()
+        length *= shrink
+    if not segments:
+        return np.empty((0, 2, 2)), np.empty(0, dtype=int)
+    return np.concatenate(segments), np.concatenate(levels)
+
+
+def sierpinski_triangles(vertices, depth):
+    """The 3**depth filled triangles of a Sierpinski triangle, as a (n, 3, 2) array."""
+    tri = np.asarray(vertices, dtype=np.float64)[None]
+    for _ in range(depth):
+        a, b, c = tri[:, 0], tri[:, 1], tri[:, 2]
+        ab, bc, ca = (a + b) / 2, (b + c) / 2, (c + a) / 2
+        # same corner order as the recursive version: (a, ab, ca), (b, bc, ab), (c, ca, bc)
+        tri = np.stack([np.stack([a, ab, ca], axis=1),
+                        np.stack([b, bc, ab], axis=1),
+                        np.stack([c, ca, bc], axis=1)], axis=1).reshape(-1, 3, 2)
+    return tri
+
+
+def koch_snowflake(order, scale=10.0):
+    """Closed Koch snowflake outline: (3 * 4**order + 1, 2) points, first == last."""
+    h = scale * np.sqrt(3) / 2
+    points = np.array([[0, 0], [scale, 0], [scale / 2, h], [0, 0]], dtype=np.float64)
+    rotation = np.array([[np.cos(np.pi / 3), -np.sin(np.pi / 3)],
+                         [np.sin(np.pi / 3), np.cos(np.pi / 3)]])
+    for _ in range(order):
+        p1 = points[:-1]
+        third = (points[1:] - p1) / 3
+        one_third = p1 + third
+        peak = one_third + third @ rotation.T
+        new = np.stack([p1, one_third, peak, p1 + 2 * third], axis=1).reshape(-1, 2)
+        points = np.concatenate([new, points[-1:]])
+    return points
+
+
+# -----------------------------
+# RENDERING
+# -----------------------------
+def add_lines(ax, segments, autoscale=True, **style):
+    """Draw (n, 2, 2) segments (or (m, k, 2) polylines) as one LineCollection."""
+    collection = LineCollection(segments, **style)
+    ax.add_collection(collection)
+    if autoscale:
+        ax.autoscale_view()
+    return collection
+
+
+def add_polygons(ax, polygons, autoscale=True, **style):
+    """Draw (n, k, 2) polygons as one PolyCollection."""
+    collection = PolyCollection(polygons, **style)
+    ax.add_collection(collection)
+    if autoscale:
+        ax.autoscale_view()
+    return collection
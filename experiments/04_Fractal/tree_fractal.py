@@ -1,43 +1,33 @@
+import sys
+
 import matplotlib.pyplot as plt
 import numpy as np
 
-
-# Recursive function to draw a tree fractal
-def draw_tree(x, y, length, angle, depth, branch_angle, shrink_factor):
-    if depth == 0:
-        return
-
-    # Calculate the end point of the branch
-    x_end = x + length * np.cos(angle)
-    y_end = y + length * np.sin(angle)
-
-    # Draw the branch
-    plt.plot([x, x_end], [y, y_end], color='brown', linewidth=depth)
-
-    # Recursively draw the left and right branches
-    draw_tree(x_end, y_end, length * shrink_factor, angle + branch_angle, depth - 1, branch_angle, shrink_factor)
-    draw_tree(x_end, y_end, length * shrink_factor, angle - branch_angle, depth - 1, branch_angle, shrink_factor)
-
+from geometry import add_lines, tree_segments
 
 # Set up the plot
-plt.figure(figsize=(8, 8))
-plt.axis('off')
+fig, ax = plt.subplots(figsize=(8, 8))
+ax.axis('off')
 
 # Initial parameters for the tree
 start_x = 0
 start_y = 0
 initial_length = 100
 initial_angle = np.pi / 2  # pointing upwards
-depth = 10
+depth = int(sys.argv[1]) if len(sys.argv) > 1 else 10  # 2**depth - 1 branches, e.g. `python tree_fractal.py 16`
 branch_angle = np.pi / 6  # 30 degrees
 shrink_factor = 0.7
 
-# Draw the tree fractal
-draw_tree(start_x, start_y, initial_length, initial_angle, depth, branch_angle, shrink_factor)
+# All branches at once: (n, 2, 2) segments and the remaining depth of each one
+segments, levels = tree_segments(depth, initial_length, initial_angle, branch_angle, shrink_factor,
+                                 origin=(start_x, start_y))
+
+# Draw the tree fractal (thicker near the trunk, like linewidth=depth per branch before)
+add_lines(ax, segments, autoscale=False, colors='brown', linewidths=levels * 10 / depth)
 
 # Adjust plot limits
-plt.xlim(-150, 150)
-plt.ylim(0, 200)
+ax.set_xlim(-150, 150)
+ax.set_ylim(0, 200)
 
 # Show the fractal tree
-plt.show()
\ No newline at end of file
+plt.show()
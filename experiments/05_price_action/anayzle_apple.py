@@ -1,12 +1,16 @@
-import yfinance as yf
 import pandas as pd
 from sklearn.model_selection import train_test_split
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.metrics import accuracy_score
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from ohlcv_cache import download
 
 # 1. Download historical stock data (example: Apple)
 ticker = "AAPL"
-data = yf.download(ticker, start="2020-01-01", end="2025-01-01")
+data = download(ticker, start="2020-01-01", end="2025-01-01")
 
 # 2. Create simple features
 data["Return"] = data["Close"].pct_change()
@@ -0,0 +1,73 @@
+"""
+Nightly headless chart export for a ticker list
+
+Renders candles, Williams fractals, Zen AI Always-In signals and mother/inside
+bars for every ticker with common/chart_export.py (Agg backend, process pool,
+one reused figure per worker) and prints the slowest charts from the
+render-time report.
+"""
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.append(os.path.join(HERE, "..", "common"))
+sys.path.append(os.path.join(HERE, "..", "04_Fractal"))
+from candles import add_signals, candlestick
+from chart_export import CHARTS, export_charts
+from fractals import box_counting_dimension, find_fractals
+from patterns import scan_frame
+from zen_ai import zen_ai_signals
+
+# USER SETTINGS
+TICKERS = ["AAPL", "GWRE", "NVDA", "MSFT", "AMZN", "GOOGL", "META", "TSLA"]
+KINDS = ["candles", "fractals", "always_in", "mother_bars"]
+PERIOD = "1y"
+OUT_DIR = "charts"
+FORMATS = ("png",)
+PROCESSES = os.cpu_count()
+
+
+def draw_fractals(ax, df, ticker):
+    bullish, bearish = find_fractals(df)
+    dimension = box_counting_dimension(df['Close'].values)["dimension"]
+    x = candlestick(ax, df, width=0.5)
+    ax.plot(x, df['Close'].rolling(20).mean(), label='MA20', color='blue', linewidth=1.2)
+    add_signals(ax, x, df['Low'], bullish, marker='v', color='green', s=60, label='Bullish Fractal')
+    add_signals(ax, x, df['High'], bearish, marker='^', color='red', s=60, label='Bearish Fractal')
+    ax.set_title(f"{ticker} Fractals (dimension {dimension:.2f})")
+    ax.legend(loc='upper left')
+
+
+def draw_always_in(ax, df, ticker):
+    signals_df = zen_ai_signals(df.copy())
+    x = candlestick(ax, signals_df)
+    ax.plot(x, signals_df['ma'], color='yellow', label='MA')
+    add_signals(ax, x, signals_df['Low'], signals_df['bull_signal'], marker='^', color='green', s=100,
+                label='Bull Signal')
+    add_signals(ax, x, signals_df['High'], signals_df['bear_signal'], marker='v', color='red', s=100,
+                label='Bear Signal')
+    ax.set_title(f"{ticker} Price with Zen AI Signals")
+    ax.legend(loc='upper left')
+
+
+def draw_mother_bars(ax, df, ticker):
+    inside = scan_frame(df, patterns=["inside_bar"])["inside_bar"]
+    x = candlestick(ax, df)
+    ax.vlines(x[inside - 1], 0, 1, transform=ax.get_xaxis_transform(), colors='purple',
+              linewidths=1, alpha=0.4)  # mother bars, one collection
+    add_signals(ax, x, df['Close'], inside, marker='^', color='orange', s=60, label='Inside Bar')
+    ax.set_title(f"{ticker} – Mother Bar / Inside Bar Pattern")
+    ax.legend(loc='upper left')
+
+
+CHARTS.update(fractals=draw_fractals, always_in=draw_always_in, mother_bars=draw_mother_bars)
+
+
+if __name__ == "__main__":
+    t0 = time.perf_counter()
+    report = export_charts(TICKERS, kinds=KINDS, out_dir=OUT_DIR, formats=FORMATS,
+                           processes=PROCESSES, period=PERIOD)
+    print(f"{len(report)} charts in {time.perf_counter() - t0:.1f}s, "
+          f"{report['error'].notna().sum()} errors, report: {OUT_DIR}/render_times.csv")
+    print(report.sort_values("seconds", ascending=False).head(10)[["ticker", "kind", "seconds", "error"]])
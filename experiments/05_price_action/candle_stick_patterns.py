@@ -1,15 +1,19 @@
 import pandas as pd
 import mplfinance as mpf
 
+from patterns import scan_frame
+
 # ---------------------------------------------------------
 # Helper function to plot a single pattern
 # ---------------------------------------------------------
 def plot_pattern(df, title):
+    # patterns the vectorized scanner finds (momentum measured against the one bar before)
+    found = [name for name, bars in scan_frame(df, momentum_lookback=1).items() if len(bars)]
     mpf.plot(
         df,
         type='candle',
         style='charles',
-        title=title,
+        title=f"{title}\nscanner: {', '.join(found) or 'none'}",
         ylabel='Price',
         figsize=(6, 4)
     )
@@ -1,45 +1,29 @@
 import pandas as pd
-import yfinance as yf
 import mplfinance as mpf
+import os
+import sys
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from ohlcv_cache import download
+from patterns import scan_frame
 
 # ---------------------------------------------------------
 # 1. Download OHLC data
 # ---------------------------------------------------------
 ticker = "AAPL"
 
-df = yf.download(
-    ticker,
-    period="6mo",
-    interval="1d",
-    auto_adjust=False
-)
-
-# Fix MultiIndex columns and duplicates
-df.columns = df.columns.get_level_values(0)
-df = df.loc[:, ~df.columns.duplicated()]
-df.columns = df.columns.astype(str)
+df = download(ticker, period="6mo", interval="1d", auto_adjust=False)
 
-# Keep only required columns
-df = df[["Open", "High", "Low", "Close", "Volume"]]
-
-# Force all columns to be numeric 1‑D Series
-df = df.apply(pd.to_numeric, errors="coerce")
+# download() returns flat, numeric Open/High/Low/Close/Volume columns (common/normalize.py);
+# auto_adjust=False keeps the unadjusted prices, cached apart from the adjusted ones
 
 # ---------------------------------------------------------
 # 2. Detect Mother Bar + Inside Bar pattern
 # ---------------------------------------------------------
-inside_indices = []
-mother_indices = []
-
-for i in range(1, len(df)):
-    high_m = float(df.at[df.index[i-1], "High"])
-    low_m  = float(df.at[df.index[i-1], "Low"])
-    high_i = float(df.at[df.index[i], "High"])
-    low_i  = float(df.at[df.index[i], "Low"])
-
-    if (high_i < high_m) and (low_i > low_m):
-        mother_indices.append(df.index[i-1])
-        inside_indices.append(df.index[i])
+# vectorized scan (patterns.py): inside = high and low strictly inside the previous bar
+hits = scan_frame(df, patterns=["inside_bar"])
+inside_indices = list(df.index[hits["inside_bar"]])
+mother_indices = list(df.index[hits["inside_bar"] - 1])
 
 # ---------------------------------------------------------
 # 3. Highlight inside bars
@@ -0,0 +1,163 @@
+"""
+Zen AI "Always-In" price action signals (Dr. Al Brooks' concepts)
+
+Key rules: two consecutive bars in the same direction, both closing on the same
+side of the MA, internal bar strength (IBS) > 65 for bulls / < 35 for bears,
+and one of the two bars exceeding the average bar range.
+
+zen_ai_signals() works on a single-ticker DataFrame and adds its columns in place;
+pass cache=default_indicator_cache() to reuse MA / average range (across runs with
+STOCKTORCH_INDICATOR_DISK=1).
+zen_ai_signals_panel() computes the same signals for a whole universe at once on
+(n_tickers, n_bars) arrays, and zen_ai_flags() packs every condition into a uint16
+bit field per bar instead of ~20 DataFrame columns.
+"""
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from indicators import cumulative, ewm, rolling_mean, shift, window
+
+
+def zen_ai_signals(df, ma_length=20, use_ema=True,
+                   ibs_bull_min=65.0, ibs_bear_max=35.0,
+                   abr_lookback=8, cache=None):
+    # Moving Average (optionally memoized, see common/indicator_cache.py)
+    if cache is not None:
+        df['ma'] = cache.compute('ema', df['Close'], span=ma_length) if use_ema else \
+            cache.compute('sma', df['Close'], n=ma_length)
+    elif use_ema:
+        df['ma'] = df['Close'].ewm(span=ma_length, adjust=False).mean()
+    else:
+        df['ma'] = df['Close'].rolling(ma_length).mean()
+
+    # Bar ranges
+    df['bar_range'] = df['High'] - df['Low']
+    if cache is not None:
+        df['avg_range'] = cache.compute('sma', df['bar_range'], n=abr_lookback)
+    else:
+        df['avg_range'] = df['bar_range'].rolling(abr_lookback).mean()
+
+    # IBS calculation
+    df['ibs'] = ((df['Close'] - df['Low']) / df['bar_range'] * 100).where(df['bar_range'] != 0, 50)
+
+    # Bull/Bear conditions
+    df['is_bull'] = df['Close'] > df['Open']
+    df['is_bear'] = df['Close'] < df['Open']
+    df['prior_bull'] = df['Close'].shift(1) > df['Open'].shift(1)
+    df['prior_bear'] = df['Close'].shift(1) < df['Open'].shift(1)
+
+    # Relation to MA
+    df['bull_above_ma_now'] = df['Close'] > df['ma']
+    df['bull_above_ma_prev'] = df['Close'].shift(1) > df['ma']
+    df['bear_below_ma_now'] = df['Close'] < df['ma']
+    df['bear_below_ma_prev'] = df['Close'].shift(1) < df['ma']
+
+    # IBS filters
+    df['bull_ibs_ok'] = (df['ibs'] > ibs_bull_min) & (df['ibs'].shift(1) > ibs_bull_min)
+    df['bear_ibs_ok'] = (df['ibs'] < ibs_bear_max) & (df['ibs'].shift(1) < ibs_bear_max)
+
+    # Range filter
+    df['range_ok'] = (df['bar_range'] > df['avg_range']) | (df['bar_range'].shift(1) > df['avg_range'])
+
+    # Signals
+    df['bull_signal'] = (df['is_bull'] & df['prior_bull'] &
+                         df['bull_above_ma_now'] & df['bull_above_ma_prev'] &
+                         df['bull_ibs_ok'] & df['range_ok'])
+
+    df['bear_signal'] = (df['is_bear'] & df['prior_bear'] &
+                         df['bear_below_ma_now'] & df['bear_below_ma_prev'] &
+                         df['bear_ibs_ok'] & df['range_ok'])
+
+    return df
+
+
+# Bit positions for zen_ai_flags(), one per boolean column of zen_ai_signals
+FLAGS = ["is_bull", "is_bear", "prior_bull", "prior_bear",
+         "bull_above_ma_now", "bull_above_ma_prev", "bear_below_ma_now", "bear_below_ma_prev",
+         "bull_ibs_ok", "bear_ibs_ok", "range_ok", "bull_signal", "bear_signal"]
+BIT = {name: 1 << i for i, name in enumerate(FLAGS)}
+BULL_SIGNAL = BIT["bull_signal"]
+BEAR_SIGNAL = BIT["bear_signal"]
+
+
+def _zen_arrays(open_, high, low, close, ma_length, use_ema, ibs_bull_min, ibs_bear_max, abr_lookback):
+    """MA, ranges, IBS and every boolean condition of zen_ai_signals as arrays (last axis = bars)."""
+    o, h, l, c = (np.asarray(a, dtype=np.float64) for a in (open_, high, low, close))
+
+    # Moving Average
+    if use_ema:
+        ma = ewm(c, 2 / (ma_length + 1))
+    else:
+        ma = rolling_mean(window(cumulative(c), ma_length), ma_length)
+
+    # Bar ranges and IBS
+    bar_range = h - l
+    avg_range = rolling_mean(window(cumulative(bar_range), abr_lookback), abr_lookback)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        ibs = np.where(bar_range != 0, (c - l) / bar_range * 100, 50.0)
+
+    prev_c, prev_o = shift(c, 1), shift(o, 1)
+    prev_ibs, prev_range = shift(ibs, 1), shift(bar_range, 1)
+
+    # NaN comparisons are False, like the pandas version
+    with np.errstate(invalid="ignore"):
+        cond = {
+            "is_bull": c > o,
+            "is_bear": c < o,
+            "prior_bull": prev_c > prev_o,
+            "prior_bear": prev_c < prev_o,
+            "bull_above_ma_now": c > ma,
+            "bull_above_ma_prev": prev_c > ma,
+            "bear_below_ma_now": c < ma,
+            "bear_below_ma_prev": prev_c < ma,
+            "bull_ibs_ok": (ibs > ibs_bull_min) & (prev_ibs > ibs_bull_min),
+            "bear_ibs_ok": (ibs < ibs_bear_max) & (prev_ibs < ibs_bear_max),
+            "range_ok": (bar_range > avg_range) | (prev_range > avg_range),
+        }
+    cond["bull_signal"] = (cond["is_bull"] & cond["prior_bull"] &
+                           cond["bull_above_ma_now"] & cond["bull_above_ma_prev"] &
+                           cond["bull_ibs_ok"] & cond["range_ok"])
+    cond["bear_signal"] = (cond["is_bear"] & cond["prior_bear"] &
+                           cond["bear_below_ma_now"] & cond["bear_below_ma_prev"] &
+                           cond["bear_ibs_ok"] & cond["range_ok"])
+    return ma, bar_range, avg_range, ibs, cond
+
+
+def zen_ai_signals_panel(open_, high, low, close, ma_length=20, use_ema=True,
+                         ibs_bull_min=65.0, ibs_bear_max=35.0, abr_lookback=8):
+    """
+    zen_ai_signals for (n_tickers, n_bars) OHLC arrays in one set of vectorized operations.
+    Bars before a ticker's listing date are NaN; every ticker then gets exactly the
+    values its own single-ticker DataFrame would give.
+    Returns a dict of (n_tickers, n_bars) arrays: ma, bar_range, avg_range, ibs,
+    bull_signal, bear_signal.
+    """
+    ma, bar_range, avg_range, ibs, cond = _zen_arrays(open_, high, low, close, ma_length, use_ema,
+                                                      ibs_bull_min, ibs_bear_max, abr_lookback)
+    return {"ma": ma, "bar_range": bar_range, "avg_range": avg_range, "ibs": ibs,
+            "bull_signal": cond["bull_signal"], "bear_signal": cond["bear_signal"]}
+
+
+def zen_ai_flags(open_, high, low, close, ma_length=20, use_ema=True,
+                 ibs_bull_min=65.0, ibs_bear_max=35.0, abr_lookback=8):
+    """
+    Compact alternative to zen_ai_signals: the inputs are left untouched and every
+    condition comes back packed as one uint16 bit field per bar (see FLAGS / BIT),
+    plus the float32 MA. Works on single series or (n_tickers, n_bars) panels.
+    For a DataFrame: zen_ai_flags(df['Open'], df['High'], df['Low'], df['Close']).
+    Test a condition with (flags & BULL_SIGNAL) != 0.
+    """
+    ma, _, _, _, cond = _zen_arrays(open_, high, low, close, ma_length, use_ema,
+                                    ibs_bull_min, ibs_bear_max, abr_lookback)
+    flags = np.zeros(ma.shape, dtype=np.uint16)
+    for name, mask in cond.items():
+        flags |= mask.astype(np.uint16) << FLAGS.index(name)
+    return flags, ma.astype(np.float32)
+
+
+def unpack_flags(flags, names=FLAGS):
+    """{name: bool array} for the requested conditions of a zen_ai_flags result."""
+    return {name: (flags & BIT[name]) != 0 for name in names}
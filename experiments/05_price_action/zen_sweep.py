@@ -0,0 +1,150 @@
+"""
+Vectorized parameter sweep for the Always-In signal
+
+sweep() evaluates zen_ai_signals for every combination of a parameter grid in
+one batched pass instead of one call per combination:
+
+- MAs are computed once per distinct (ma_length, use_ema) and average ranges
+  once per distinct abr_lookback
+- IBS thresholds only compare one precomputed min/max-of-two-bars array
+- each combination is then just an AND of rows picked from those tables,
+  broadcast to a (params x bars) signal tensor: +1 bull, -1 bear, 0 none
+
+The grid is split into chunks that run on a process pool when processes > 1.
+
+    grid = {"ma_length": [10, 20, 50], "use_ema": [True, False],
+            "ibs_bull_min": [55, 60, 65, 70], "ibs_bear_max": [30, 35, 40, 45],
+            "abr_lookback": [5, 8, 13]}
+    signals, summary = sweep(df["Open"], df["High"], df["Low"], df["Close"], grid, processes=4)
+"""
+import itertools
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "common"))
+from indicators import cumulative, ewm, rolling_mean, shift, window
+
+PARAMS = ["ma_length", "use_ema", "ibs_bull_min", "ibs_bear_max", "abr_lookback"]
+DEFAULTS = {"ma_length": 20, "use_ema": True, "ibs_bull_min": 65.0, "ibs_bear_max": 35.0, "abr_lookback": 8}
+
+_ohlc = None  # per-worker copy of the OHLC arrays, set by _init_worker
+
+
+def expand_grid(grid):
+    """DataFrame with one row per parameter combination (missing keys use the defaults)."""
+    values = [list(grid.get(p, [DEFAULTS[p]])) for p in PARAMS]
+    return pd.DataFrame(list(itertools.product(*values)), columns=PARAMS)
+
+
+def _init_worker(ohlc):
+    global _ohlc
+    _ohlc = ohlc
+
+
+def _sweep_chunk(params):
+    """(len(params), n_bars) int8 signals for a parameter DataFrame."""
+    o, h, l, c = _ohlc
+    prev_c, prev_o = shift(c, 1), shift(o, 1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        bar_range = h - l
+        ibs = np.where(bar_range != 0, (c - l) / bar_range * 100, 50.0)
+        prev_ibs, prev_range = shift(ibs, 1), shift(bar_range, 1)
+        # both bars pass "ibs > t" iff the smaller one does (NaN -> fails every threshold)
+        ibs_low = np.where(np.isnan(prev_ibs), -np.inf, np.minimum(ibs, prev_ibs))
+        ibs_high = np.where(np.isnan(prev_ibs), np.inf, np.maximum(ibs, prev_ibs))
+        two_bull = (c > o) & (prev_c > prev_o)
+        two_bear = (c < o) & (prev_c < prev_o)
+
+    # one MA / average range per distinct setting
+    ma_keys = list(dict.fromkeys(zip(params["ma_length"], params["use_ema"])))
+    mas = np.stack([ewm(c, 2 / (n + 1)) if use_ema else rolling_mean(window(cumulative(c), n), n)
+                    for n, use_ema in ma_keys])
+    abr_keys = list(dict.fromkeys(params["abr_lookback"]))
+    range_cum = cumulative(bar_range)
+    avg_ranges = np.stack([rolling_mean(window(range_cum, n), n) for n in abr_keys])
+
+    with np.errstate(invalid="ignore"):
+        above_ma = (c > mas) & (prev_c > mas)
+        below_ma = (c < mas) & (prev_c < mas)
+        range_ok = (bar_range > avg_ranges) | (prev_range > avg_ranges)
+        bull_thr = np.unique(params["ibs_bull_min"].to_numpy(dtype=np.float64))
+        bear_thr = np.unique(params["ibs_bear_max"].to_numpy(dtype=np.float64))
+        bull_ibs = ibs_low > bull_thr[:, None]
+        bear_ibs = ibs_high < bear_thr[:, None]
+
+    # broadcast the tables to one row per combination
+    i_ma = [ma_keys.index(k) for k in zip(params["ma_length"], params["use_ema"])]
+    i_abr = [abr_keys.index(k) for k in params["abr_lookback"]]
+    i_bull = np.searchsorted(bull_thr, params["ibs_bull_min"].to_numpy(dtype=np.float64))
+    i_bear = np.searchsorted(bear_thr, params["ibs_bear_max"].to_numpy(dtype=np.float64))
+
+    bull = two_bull & above_ma[i_ma] & bull_ibs[i_bull] & range_ok[i_abr]
+    bear = two_bear & below_ma[i_ma] & bear_ibs[i_bear] & range_ok[i_abr]
+    return bull.astype(np.int8) - bear.astype(np.int8)
+
+
+def summarize(params, signals, close):
+    """Signal counts and next-bar hit rates for every combination."""
+    c = np.asarray(close, dtype=np.float64)
+    with np.errstate(invalid="ignore"):
+        move = np.sign(shift(c, -1) - c)  # NaN on the last bar
+    bull, bear = signals == 1, signals == -1
+    known = ~np.isnan(move)
+    n_bull = (bull & known).sum(axis=1)
+    n_bear = (bear & known).sum(axis=1)
+    bull_hits = (bull & (move > 0)).sum(axis=1)
+    bear_hits = (bear & (move < 0)).sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        summary = params.assign(
+            n_bull=(signals == 1).sum(axis=1),
+            n_bear=(signals == -1).sum(axis=1),
+            bull_hit_rate=bull_hits / n_bull,
+            bear_hit_rate=bear_hits / n_bear,
+            hit_rate=(bull_hits + bear_hits) / (n_bull + n_bear),
+        )
+    return summary
+
+
+def sweep(open_, high, low, close, grid, processes=None, chunk_size=2000):
+    """
+    All combinations of `grid` in one batched pass.
+    Returns (signals, summary): an int8 (n_params, n_bars) tensor with +1 bull / -1 bear
+    and a DataFrame with the parameters, signal counts and next-bar hit rates.
+    """
+    ohlc = tuple(np.asarray(a, dtype=np.float64) for a in (open_, high, low, close))
+    params = expand_grid(grid)
+    chunks = [params.iloc[i:i + chunk_size] for i in range(0, len(params), chunk_size)]
+
+    if processes and processes > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=(ohlc,)) as pool:
+            parts = list(pool.map(_sweep_chunk, chunks))
+    else:
+        _init_worker(ohlc)
+        parts = [_sweep_chunk(chunk) for chunk in chunks]
+
+    signals = np.concatenate(parts) if parts else np.zeros((0, len(ohlc[3])), dtype=np.int8)
+    return signals, summarize(params, signals, ohlc[3])
+
+
+if __name__ == "__main__":
+    rng = np.random.default_rng(0)
+    n = 2520  # ~10 years of daily bars
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, n)))
+    open_ = close * (1 + rng.normal(0, 0.008, n))
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.006, n)))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.006, n)))
+
+    grid = {"ma_length": [5, 8, 10, 13, 15, 20, 30, 50, 100, 200],
+            "use_ema": [True, False],
+            "ibs_bull_min": np.arange(50, 80, 3),
+            "ibs_bear_max": np.arange(20, 50, 3),
+            "abr_lookback": [3, 5, 8, 13, 21]}
+    t0 = time.perf_counter()
+    signals, summary = sweep(open_, high, low, close, grid, processes=os.cpu_count())
+    print(f"{len(summary)} combinations x {n} bars in {time.perf_counter() - t0:.2f}s")
+    print(summary.sort_values("hit_rate", ascending=False).head(10))
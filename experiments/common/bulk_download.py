@@ -0,0 +1,179 @@
+"""
+Thread-pooled bulk downloader
+
+fetch_many() pulls a list of tickers through the OHLCV cache on a bounded
+thread pool. Provider calls are retried with exponential backoff and throttled
+by a per-provider rate limit; cache hits never touch the network or the limit.
+The result is one panel aligned on the union of all dates, with columns
+(ticker, field) like yf.download(..., group_by='ticker'). panel[ticker] (or
+split_panel) gives back a plain single-ticker frame for zen_ai_signals,
+find_fractals and create_features.
+"""
+import random
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from ohlcv_cache import CsvProvider, OHLCVCache, Provider, default_cache, period_start
+
+# requests per second allowed for each provider name
+RATE_LIMITS = {"yahoo": 2.0}
+
+
+# -----------------------------
+# RATE LIMITING
+# -----------------------------
+class RateLimiter:
+    """Thread-safe token bucket: `rate` calls per second with bursts up to `burst`."""
+
+    def __init__(self, rate, burst=1):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.last = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.burst, self.tokens + (now - self.last) * self.rate)
+                self.last = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+
+def limiter_for(provider_name):
+    """Shared limiter per provider name, so concurrent fetch_many calls respect one budget."""
+    with _limiters_lock:
+        if provider_name not in _limiters and provider_name in RATE_LIMITS:
+            _limiters[provider_name] = RateLimiter(RATE_LIMITS[provider_name])
+        return _limiters.get(provider_name)
+
+
+class RetryingProvider(Provider):
+    """Wraps a provider with a rate limit and retry/backoff on errors."""
+
+    def __init__(self, provider, limiter=None, retries=3, backoff=0.5):
+        self.provider = provider
+        self.name = provider.name
+        self.adjustment = provider.adjustment
+        self.limiter = limiter
+        self.retries = retries
+        self.backoff = backoff
+
+    def fetch(self, ticker, start, end, interval="1d"):
+        for attempt in range(self.retries + 1):
+            if self.limiter is not None:
+                self.limiter.acquire()
+            try:
+                return self.provider.fetch(ticker, start, end, interval)
+            except Exception:
+                if attempt == self.retries:
+                    raise
+                time.sleep(self.backoff * 2 ** attempt * (1 + random.random()))
+
+
+class LatencyProvider(Provider):
+    """Local stand-in that adds latency (and optional random failures) to another provider."""
+
+    def __init__(self, provider, latency=0.05, fail_rate=0.0):
+        self.provider = provider
+        self.name = provider.name
+        self.adjustment = provider.adjustment
+        self.latency = latency
+        self.fail_rate = fail_rate
+
+    def fetch(self, ticker, start, end, interval="1d"):
+        time.sleep(self.latency)
+        if random.random() < self.fail_rate:
+            raise ConnectionError(f"Injected failure for {ticker}")
+        return self.provider.fetch(ticker, start, end, interval)
+
+
+# -----------------------------
+# BULK FETCH
+# -----------------------------
+def fetch_many(tickers, start=None, end=None, period=None, interval="1d", auto_adjust=True, cache=None,
+               max_workers=8, retries=3, backoff=0.5):
+    """
+    Download many tickers concurrently and return one aligned (ticker, field) panel.
+    Tickers that still fail after all retries are left out and listed in panel.attrs['errors'].
+    """
+    cache = cache if cache is not None else default_cache(auto_adjust)
+    if start is None:
+        start = period_start(period or "max")
+    provider = RetryingProvider(cache.provider, limiter_for(cache.provider.name), retries, backoff)
+    pooled = OHLCVCache(provider, cache.cache_dir, cache.refresh_seconds)
+    tickers = list(dict.fromkeys(t.upper() for t in tickers))
+
+    def fetch_one(ticker):
+        try:
+            return ticker, pooled.get(ticker, start, end, interval), None
+        except Exception as e:
+            return ticker, None, e
+
+    frames, errors = {}, {}
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        for ticker, df, error in pool.map(fetch_one, tickers):
+            if error is not None:
+                errors[ticker] = repr(error)
+            elif not df.empty:
+                frames[ticker] = df
+
+    panel = pd.concat(frames, axis=1) if frames else pd.DataFrame()
+    panel.attrs["errors"] = errors
+    return panel
+
+
+def split_panel(panel):
+    """Single-ticker frames from a panel, trimmed to each ticker's own dates."""
+    tickers = panel.columns.get_level_values(0).unique() if not panel.empty else []
+    return {t: panel[t].dropna(how="all").copy() for t in tickers}
+
+
+def panel_arrays(panel, fields=("Open", "High", "Low", "Close")):
+    """(tickers, dates, {field: (n_tickers, n_bars) array}) for the panel-mode functions."""
+    tickers = list(panel.columns.get_level_values(0).unique())
+    arrays = {f: panel.xs(f, axis=1, level=1)[tickers].to_numpy(dtype=np.float64).T for f in fields}
+    return tickers, panel.index, arrays
+
+
+if __name__ == "__main__":
+    # Offline demo: 40 synthetic tickers behind a provider with 50ms latency
+    rng = np.random.default_rng(0)
+    folder = tempfile.mkdtemp()
+    dates = pd.bdate_range("2024-01-01", periods=250)
+    names = [f"T{i:02d}" for i in range(40)]
+    for name in names:
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(dates))))
+        open_ = close * (1 + rng.normal(0, 0.003, len(dates)))
+        pd.DataFrame({"Open": open_, "High": np.maximum(open_, close) * 1.01,
+                      "Low": np.minimum(open_, close) * 0.99, "Close": close,
+                      "Volume": rng.integers(1e5, 1e6, len(dates))},
+                     index=pd.Index(dates, name="Date")).to_csv(f"{folder}/{name}.csv")
+
+    cache = OHLCVCache(LatencyProvider(CsvProvider(folder), latency=0.05, fail_rate=0.1),
+                       cache_dir=f"{folder}/cache")
+    t0 = time.perf_counter()
+    panel = fetch_many(names, start="2024-01-01", end="2025-01-01", cache=cache,
+                       max_workers=16, backoff=0.01)
+    t1 = time.perf_counter()
+    fetch_many(names, start="2024-01-01", end="2025-01-01", cache=cache)
+    t2 = time.perf_counter()
+
+    print(f"Panel shape: {panel.shape}, errors: {panel.attrs['errors']}")
+    print(f"Cold fetch: {t1 - t0:.2f}s (sequential would be >= {0.05 * len(names):.2f}s)")
+    print(f"Warm fetch: {t2 - t1:.3f}s")
+    print(split_panel(panel)["T00"].tail())
@@ -0,0 +1,138 @@
+"""
+Headless batch chart export
+
+export_charts() renders charts for many tickers without a display: every
+worker process draws on one Agg Figure/Axes pair that it creates once and
+clears between charts, instead of building (and leaking) a pyplot figure per
+chart. Data is fetched up front through fetch_many (cached, thread-pooled) and
+each worker gets all chart kinds of one ticker, so every frame is sent once.
+
+A chart kind is a function draw(ax, df, ticker) registered in CHARTS. The run
+writes <out_dir>/<TICKER>_<kind>.<fmt> for every format plus render_times.csv
+with the render time (and any error) of each chart.
+
+    report = export_charts(["AAPL", "GWRE"], kinds=["candles"], out_dir="charts",
+                           formats=("png", "svg"), processes=8)
+"""
+import os
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from bulk_download import fetch_many, split_panel
+from candles import candlestick
+
+
+# -----------------------------
+# CHART KINDS
+# -----------------------------
+def draw_candles(ax, df, ticker):
+    """Candles with 20/50-bar moving averages."""
+    x = candlestick(ax, df)
+    ax.plot(x, df['Close'].rolling(20).mean(), color='blue', linewidth=1.2, label='MA20')
+    ax.plot(x, df['Close'].rolling(50).mean(), color='orange', linewidth=1.2, label='MA50')
+    ax.set_title(f"{ticker} Candlestick Chart")
+    ax.legend(loc='upper left')
+
+
+CHARTS = {"candles": draw_candles}
+
+
+# -----------------------------
+# WORKERS
+# -----------------------------
+_worker = {}  # per-process figure, axes and chart functions, set by _init_worker
+
+
+def _init_worker(charts, figsize, dpi):
+    figure = Figure(figsize=figsize, dpi=dpi)
+    FigureCanvasAgg(figure)
+    axes = figure.add_subplot()
+    figure.subplots_adjust(left=0.07, right=0.97, bottom=0.1, top=0.93)
+    _worker.update(figure=figure, axes=axes, charts=charts)
+
+
+def _render_ticker(task):
+    """Render every requested kind for one ticker on the worker's reused axes."""
+    ticker, df, kinds, out_dir, formats = task
+    figure, ax, charts = _worker["figure"], _worker["axes"], _worker["charts"]
+    rows = []
+    for kind in kinds:
+        t0 = time.perf_counter()
+        files, error = [], None
+        try:
+            ax.clear()
+            charts[kind](ax, df, ticker)
+            for fmt in formats:
+                path = os.path.join(out_dir, f"{ticker}_{kind}.{fmt}")
+                figure.savefig(path, format=fmt)
+                files.append(path)
+        except Exception as e:
+            error = repr(e)
+        rows.append({"ticker": ticker, "kind": kind, "bars": len(df),
+                     "seconds": time.perf_counter() - t0, "files": ";".join(files), "error": error})
+    return rows
+
+
+# -----------------------------
+# BATCH EXPORT
+# -----------------------------
+def export_charts(tickers, kinds=("candles",), out_dir="charts", formats=("png",), processes=None,
+                  period="1y", interval="1d", cache=None, charts=None, figsize=(12, 6), dpi=100):
+    """
+    Render `kinds` for every ticker into out_dir and return the per-chart report.
+    tickers: list of symbols (fetched with fetch_many) or a {ticker: DataFrame} dict.
+    charts: chart kinds to use instead of CHARTS.
+    """
+    charts = CHARTS if charts is None else charts
+    unknown = [k for k in kinds if k not in charts]
+    if unknown:
+        raise ValueError(f"Unknown chart kinds: {unknown}")
+    os.makedirs(out_dir, exist_ok=True)
+
+    rows = []
+    if isinstance(tickers, dict):
+        frames = tickers
+    else:
+        panel = fetch_many(tickers, period=period, interval=interval, cache=cache)
+        frames = split_panel(panel)
+        rows += [{"ticker": t, "kind": k, "bars": 0, "seconds": 0.0, "files": "", "error": e}
+                 for t, e in panel.attrs.get("errors", {}).items() for k in kinds]
+
+    tasks = [(t, df, list(kinds), out_dir, tuple(formats)) for t, df in frames.items()]
+    initargs = (charts, figsize, dpi)
+    if processes and processes > 1 and len(tasks) > 1:
+        with ProcessPoolExecutor(processes, initializer=_init_worker, initargs=initargs) as pool:
+            for result in pool.map(_render_ticker, tasks):
+                rows += result
+    else:
+        _init_worker(*initargs)
+        for task in tasks:
+            rows += _render_ticker(task)
+
+    report = pd.DataFrame(rows, columns=["ticker", "kind", "bars", "seconds", "files", "error"])
+    report.to_csv(os.path.join(out_dir, "render_times.csv"), index=False)
+    return report
+
+
+if __name__ == "__main__":
+    # Offline demo: 64 synthetic tickers x 2 years of daily bars
+    rng = np.random.default_rng(0)
+    dates = pd.bdate_range("2023-01-02", periods=504)
+    frames = {}
+    for i in range(64):
+        close = 100 * np.exp(np.cumsum(rng.normal(0, 0.015, len(dates))))
+        open_ = close * (1 + rng.normal(0, 0.005, len(dates)))
+        frames[f"T{i:02d}"] = pd.DataFrame({"Open": open_, "High": np.maximum(open_, close) * 1.01,
+                                            "Low": np.minimum(open_, close) * 0.99, "Close": close},
+                                           index=dates)
+    out_dir = tempfile.mkdtemp()
+    t0 = time.perf_counter()
+    report = export_charts(frames, out_dir=out_dir, processes=os.cpu_count())
+    print(f"{len(report)} charts in {time.perf_counter() - t0:.2f}s -> {out_dir}")
+    print(report["seconds"].describe())
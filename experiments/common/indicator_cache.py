@@ -0,0 +1,307 @@
+"""
+Memoized indicator cache
+
+IndicatorCache.compute(name, series, **params) returns the indicator for a
+series and remembers it under (series fingerprint, name, params):
+
+- In memory: LRU eviction once the stored results exceed `budget_bytes`
+- On disk (optional `disk_dir`): results survive between runs, least recently
+  used files are deleted once the folder exceeds `disk_budget_bytes`. The folder
+  is listed once and then indexed in memory
+- Appended bars: when the series starts with a series that is already cached,
+  only the new bars are computed. Windowed indicators recompute the last
+  window, recursive ones (EMA, RSI) continue from their stored state. Only
+  cached series with the same first HEAD_BARS bars are checked as prefixes.
+
+stats() exposes hit/miss/extension/eviction and byte counters for tuning the budget.
+
+Supported indicators: sma(n), std(n), ema(span), rsi(period), bollinger(n, k).
+"""
+import hashlib
+import os
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+
+from indicators import cumulative, ewm, rolling_mean, rolling_std, window
+from ohlcv_cache import CACHE_DIR
+
+DEFAULT_BUDGET = 256 * 1024 * 1024
+DEFAULT_DISK_BUDGET = 64 * 1024 * 1024
+DISK_TIER = os.environ.get("STOCKTORCH_INDICATOR_DISK") == "1"  # opt-in, see default_indicator_cache()
+HEAD_BARS = 16  # series sharing their first bars (usually one ticker) are prefix candidates
+EPS = 1e-12
+
+
+# -----------------------------
+# INDICATORS: batch(x) -> (values, state), extend(x, m, values, state) -> (new values, state)
+# -----------------------------
+def _windowed(fn):
+    def batch(x, **p):
+        return fn(x, **p), np.empty(0)
+
+    def extend(x, m, values, state, **p):
+        # the first new bar only needs the n - 1 bars before it
+        lookback = p["n"] - 1
+        start = max(m - lookback, 0)
+        return fn(x[start:], **p)[m - start:], state
+
+    return batch, extend
+
+
+def _sma(x, n):
+    return rolling_mean(window(cumulative(x), n), n)
+
+
+def _std(x, n):
+    return rolling_std(window(cumulative(x), n), n)
+
+
+def _bollinger(x, n, k=2.0):
+    w = window(cumulative(x), n)
+    mean, std = rolling_mean(w, n), rolling_std(w, n)
+    return np.stack([mean, mean + k * std, mean - k * std], axis=-1)
+
+
+def _seeded_ewm(seed, x, alpha):
+    """ewm(adjust=False) of x continuing from a previous value `seed`."""
+    if np.isnan(seed):
+        return ewm(x, alpha)
+    return ewm(np.concatenate([[seed], x]), alpha)[1:]
+
+
+def _ema_batch(x, span):
+    values = ewm(x, 2 / (span + 1))
+    return values, values[-1:]
+
+
+def _ema_extend(x, m, values, state, span):
+    new = _seeded_ewm(state[0] if len(state) else np.nan, x[m:], 2 / (span + 1))
+    return new, new[-1:] if len(new) else state
+
+
+def _rsi_parts(x, period, prev=np.nan, gain_seed=np.nan, loss_seed=np.nan):
+    delta = np.diff(np.concatenate([[prev], x]))
+    gain = np.where(np.isnan(delta), np.nan, np.maximum(delta, 0.0))
+    loss = np.where(np.isnan(delta), np.nan, np.maximum(-delta, 0.0))
+    avg_gain = _seeded_ewm(gain_seed, gain, 1 / period)
+    avg_loss = _seeded_ewm(loss_seed, loss, 1 / period)
+    rsi = 100 - 100 / (1 + avg_gain / (avg_loss + EPS))
+    state = np.array([x[-1], avg_gain[-1], avg_loss[-1]]) if len(x) else np.array([prev, gain_seed, loss_seed])
+    return rsi, state
+
+
+def _rsi_batch(x, period):
+    return _rsi_parts(x, period)
+
+
+def _rsi_extend(x, m, values, state, period):
+    return _rsi_parts(x[m:], period, *state)
+
+
+INDICATORS = {
+    "sma": _windowed(_sma),
+    "std": _windowed(_std),
+    "bollinger": _windowed(_bollinger),
+    "ema": (_ema_batch, _ema_extend),
+    "rsi": (_rsi_batch, _rsi_extend),
+}
+
+
+def fingerprint(x):
+    return hashlib.blake2b(np.ascontiguousarray(x).tobytes(), digest_size=16).hexdigest()
+
+
+def series_head(x):
+    """Short fingerprint of the first HEAD_BARS bars, or None for shorter series."""
+    if len(x) < HEAD_BARS:
+        return None
+    return hashlib.blake2b(np.ascontiguousarray(x[:HEAD_BARS]).tobytes(), digest_size=6).hexdigest()
+
+
+def _pkey_hash(pkey):
+    return hashlib.blake2b(repr(pkey).encode(), digest_size=8).hexdigest()
+
+
+# -----------------------------
+# CACHE
+# -----------------------------
+class IndicatorCache:
+    def __init__(self, budget_bytes=DEFAULT_BUDGET, disk_dir=None, disk_budget_bytes=DEFAULT_DISK_BUDGET):
+        self.budget_bytes = budget_bytes
+        self.disk_dir = disk_dir
+        self.disk_budget_bytes = disk_budget_bytes
+        self.entries = OrderedDict()  # (fp, length, name, params) -> (values, state, head)
+        self.lineage = {}  # (name, params, head) -> {(fp, length)}
+        self.disk_files = None  # file name -> bytes, least recently used first (read on first use)
+        self.disk_lineage = {}  # (indicator hash, head) -> {(fp, length)}
+        self.counters = {"hits": 0, "misses": 0, "extensions": 0, "disk_hits": 0,
+                         "evictions": 0, "disk_evictions": 0, "bytes": 0, "disk_bytes": 0}
+
+    def stats(self):
+        return dict(self.counters, entries=len(self.entries), budget_bytes=self.budget_bytes,
+                    disk_budget_bytes=self.disk_budget_bytes)
+
+    def compute(self, name, series, **params):
+        """Indicator values for series (NumPy array or pandas Series of floats)."""
+        batch, extend = INDICATORS[name]
+        index = getattr(series, "index", None)
+        x = np.asarray(series, dtype=np.float64)
+        pkey = (name, tuple(sorted(params.items())))
+        fp = fingerprint(x)
+        key = (fp, len(x)) + pkey
+        head = series_head(x)
+
+        if key in self.entries:
+            self.counters["hits"] += 1
+            self.entries.move_to_end(key)
+            return self._wrap(self.entries[key][0], index)
+
+        found = self._load_disk(key, head)
+        if found is not None:
+            self.counters["disk_hits"] += 1
+            values, state = found
+        else:
+            prefix = self._find_prefix(x, pkey, head)
+            if prefix is not None:
+                self.counters["extensions"] += 1
+                m, old_values, old_state = prefix
+                new_values, state = extend(x, m, old_values, old_state, **params)
+                values = np.concatenate([old_values, new_values])
+            else:
+                self.counters["misses"] += 1
+                values, state = batch(x, **params)
+            self._save_disk(key, head, values, state)
+
+        self._store(key, head, values, state)
+        return self._wrap(values, index)
+
+    def _wrap(self, values, index):
+        if index is None:
+            return values
+        if values.ndim == 1:
+            return pd.Series(values, index=index)
+        return pd.DataFrame(values, index=index, columns=["mean", "upper", "lower"])
+
+    def _find_prefix(self, x, pkey, head):
+        """
+        Longest cached (values, state) whose source series is a prefix of x. Only series with
+        the same first HEAD_BARS bars (usually the same ticker) are candidates.
+        """
+        if head is None:
+            return None
+        candidates = {(fp, m) for fp, m in self.lineage.get(pkey + (head,), ()) if m < len(x)}
+        if self.disk_dir is not None:
+            self._scan_disk()
+            candidates |= {(fp, m) for fp, m in self.disk_lineage.get((_pkey_hash(pkey), head), ())
+                           if m < len(x)}
+        for fp, m in sorted(candidates, key=lambda c: -c[1]):
+            if fingerprint(x[:m]) == fp:
+                key = (fp, m) + pkey
+                entry = self.entries[key][:2] if key in self.entries else self._load_disk(key, head)
+                if entry is not None:
+                    return (m,) + tuple(entry)
+        return None
+
+    def _store(self, key, head, values, state):
+        self.entries[key] = (values, state, head)
+        if head is not None:
+            self.lineage.setdefault(key[2:] + (head,), set()).add(key[:2])
+        self.counters["bytes"] += values.nbytes + state.nbytes
+        while self.counters["bytes"] > self.budget_bytes and len(self.entries) > 1:
+            old_key, (old_values, old_state, old_head) = self.entries.popitem(last=False)
+            if old_head is not None:
+                self.lineage[old_key[2:] + (old_head,)].discard(old_key[:2])
+            self.counters["bytes"] -= old_values.nbytes + old_state.nbytes
+            self.counters["evictions"] += 1
+
+    # -----------------------------
+    # DISK TIER: <disk_dir>/<indicator hash>_<head>_<fingerprint>_<length>.npz
+    # -----------------------------
+    def _disk_name(self, key, head):
+        return f"{_pkey_hash(key[2:])}_{head or 'short'}_{key[0]}_{key[1]}.npz"
+
+    def _scan_disk(self):
+        """Index the disk tier once (one directory listing), least recently used first."""
+        if self.disk_files is not None:
+            return
+        self.disk_files = OrderedDict()
+        self.counters["disk_bytes"] = 0
+        if not os.path.isdir(self.disk_dir):
+            return
+        found = []
+        for entry in os.scandir(self.disk_dir):
+            if entry.name.endswith(".npz") and not entry.name.endswith(".tmp.npz"):
+                stat = entry.stat()
+                found.append((stat.st_mtime, entry.name, stat.st_size))
+        for _, fname, size in sorted(found):
+            self._index_disk(fname, size)
+
+    def _index_disk(self, fname, size):
+        self.disk_files[fname] = size
+        self.counters["disk_bytes"] += size
+        parts = fname[:-4].split("_")
+        if len(parts) == 4 and parts[1] != "short":  # files of older layouts only count toward the budget
+            self.disk_lineage.setdefault((parts[0], parts[1]), set()).add((parts[2], int(parts[3])))
+
+    def _unindex_disk(self, fname):
+        self.counters["disk_bytes"] -= self.disk_files.pop(fname)
+        parts = fname[:-4].split("_")
+        if len(parts) == 4 and parts[1] != "short":
+            self.disk_lineage[(parts[0], parts[1])].discard((parts[2], int(parts[3])))
+
+    def _load_disk(self, key, head):
+        if self.disk_dir is None:
+            return None
+        self._scan_disk()
+        fname = self._disk_name(key, head)
+        if fname not in self.disk_files:
+            return None
+        path = os.path.join(self.disk_dir, fname)
+        try:
+            with np.load(path) as f:
+                found = f["values"], f["state"]
+            os.utime(path)  # last use, so the LRU order survives between runs
+        except FileNotFoundError:  # removed by another process
+            self._unindex_disk(fname)
+            return None
+        self.disk_files.move_to_end(fname)
+        return found
+
+    def _save_disk(self, key, head, values, state):
+        if self.disk_dir is None:
+            return
+        self._scan_disk()
+        os.makedirs(self.disk_dir, exist_ok=True)
+        fname = self._disk_name(key, head)
+        path = os.path.join(self.disk_dir, fname)
+        tmp = path[:-4] + ".tmp.npz"
+        np.savez(tmp, values=values, state=state)
+        os.replace(tmp, path)
+        if fname in self.disk_files:
+            self._unindex_disk(fname)
+        self._index_disk(fname, os.path.getsize(path))
+        # least recently used files go first once the tier is over its budget
+        while self.counters["disk_bytes"] > self.disk_budget_bytes and len(self.disk_files) > 1:
+            old = next(iter(self.disk_files))
+            self._unindex_disk(old)
+            try:
+                os.remove(os.path.join(self.disk_dir, old))
+            except FileNotFoundError:
+                pass
+            self.counters["disk_evictions"] += 1
+
+
+_default_cache = None
+
+
+def default_indicator_cache(disk=DISK_TIER):
+    """
+    Process-wide cache. With disk=True (or STOCKTORCH_INDICATOR_DISK=1) results are also kept
+    between runs under the OHLCV cache folder, within DEFAULT_DISK_BUDGET.
+    """
+    global _default_cache
+    if _default_cache is None:
+        _default_cache = IndicatorCache(disk_dir=os.path.join(CACHE_DIR, "indicators") if disk else None)
+    return _default_cache
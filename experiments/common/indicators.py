@@ -0,0 +1,206 @@
+"""
+Shared vectorized indicator library
+
+A request for a set of indicators is planned into a dependency graph before
+anything is computed. Every node is identified by a key such as
+("sma", ("input", "Close"), 20), so identical sub-expressions collapse into one
+node: MA5/MA10/MA20/STD20 all reuse a single cumulative-sum pass over Close,
+MACD reuses EMA12 and EMA26, RSI and Return share one diff, Bollinger bands
+reuse the 20-bar mean and std. The plan then runs once in float64 and fills a
+single feature matrix, float32 by default (dtype=np.float64 keeps full precision).
+
+Indicator names follow the feature names used in Guidewire_Predict:
+
+    Return, MA<n>, EMA<n>, STD<n>, RSI<n>, MACD, MACD_<fast>_<slow>,
+    BB_upper, BB_lower, BB_width (20, 2) or BB_upper_<n>_<k> ...,
+    Volatility_<n>, lag_<k>, lead_<k>, bar_range, avg_range_<n>, ibs
+
+All kernels work along the last axis, so the same plan runs on one series
+(n_bars,) or a panel (n_tickers, n_bars). Windows that contain NaN (e.g. before
+a ticker's listing date) give NaN, like pandas rolling(n).
+"""
+import re
+
+import numpy as np
+import pandas as pd
+
+EPS = 1e-12
+
+
+# -----------------------------
+# KERNELS (along the last axis)
+# -----------------------------
+def shift(x, k):
+    out = np.full_like(x, np.nan)
+    if k > 0:
+        out[..., k:] = x[..., :-k]
+    elif k < 0:
+        out[..., :k] = x[..., -k:]
+    else:
+        out[...] = x
+    return out
+
+
+def ewm(x, alpha):
+    """pandas ewm(alpha=alpha, adjust=False).mean() along the last axis."""
+    flat = x.reshape(-1, x.shape[-1]).T
+    out = pd.DataFrame(flat).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    return out.T.reshape(x.shape)
+
+
+def cumulative(x):
+    """Centered running sums shared by every rolling window over x."""
+    center = np.nanmean(x, axis=-1, keepdims=True) if x.shape[-1] else np.zeros(x.shape[:-1] + (1,))
+    center = np.nan_to_num(center)
+    valid = ~np.isnan(x)
+    d = np.where(valid, x - center, 0.0)
+    pad = [(0, 0)] * (x.ndim - 1) + [(1, 0)]
+    s1 = np.pad(np.cumsum(d, axis=-1), pad)
+    s2 = np.pad(np.cumsum(d * d, axis=-1), pad)
+    cnt = np.pad(np.cumsum(valid, axis=-1), pad)
+    return center, s1, s2, cnt
+
+
+def window(cum, n):
+    """Window sum, sum of squares and count of the centered values for every bar."""
+    center, s1, s2, cnt = cum
+    total = s1.shape[-1] - 1
+    ws1 = np.full(s1.shape[:-1] + (total,), np.nan)
+    ws2 = np.full_like(ws1, np.nan)
+    wcnt = np.zeros_like(ws1)
+    if n <= total:
+        ws1[..., n - 1:] = s1[..., n:] - s1[..., :-n]
+        ws2[..., n - 1:] = s2[..., n:] - s2[..., :-n]
+        wcnt[..., n - 1:] = cnt[..., n:] - cnt[..., :-n]
+    full = wcnt == n
+    ws1[~full] = np.nan
+    ws2[~full] = np.nan
+    return center, ws1, ws2
+
+
+def rolling_mean(w, n):
+    center, ws1, _ = w
+    return ws1 / n + center
+
+
+def rolling_std(w, n):
+    _, ws1, ws2 = w
+    var = (ws2 - ws1 * ws1 / n) / (n - 1) if n > 1 else np.full_like(ws1, np.nan)
+    return np.sqrt(np.maximum(var, 0.0))
+
+
+# -----------------------------
+# GRAPH NODES
+# -----------------------------
+# op -> (dependencies of a key, function of the dependency values)
+NODES = {
+    "diff": (lambda k: [k[1], ("shift", k[1], 1)], lambda k, x, prev: x - prev),
+    "shift": (lambda k: [k[1]], lambda k, x: shift(x, k[2])),
+    "pct": (lambda k: [("diff", k[1]), ("shift", k[1], 1)], lambda k, d, prev: d / prev),
+    "cum": (lambda k: [k[1]], lambda k, x: cumulative(x)),
+    "window": (lambda k: [("cum", k[1])], lambda k, cum: window(cum, k[2])),
+    "sma": (lambda k: [("window", k[1], k[2])], lambda k, w: rolling_mean(w, k[2])),
+    "std": (lambda k: [("window", k[1], k[2])], lambda k, w: rolling_std(w, k[2])),
+    "ema": (lambda k: [k[1]], lambda k, x: ewm(x, k[2])),
+    "gain": (lambda k: [("diff", k[1])], lambda k, d: np.where(np.isnan(d), np.nan, np.maximum(d, 0.0))),
+    "loss": (lambda k: [("diff", k[1])], lambda k, d: np.where(np.isnan(d), np.nan, np.maximum(-d, 0.0))),
+    "rsi": (lambda k: [("ema", ("gain", k[1]), 1 / k[2]), ("ema", ("loss", k[1]), 1 / k[2])],
+            lambda k, g, l: 100 - 100 / (1 + g / (l + EPS))),
+    "sub": (lambda k: [k[1], k[2]], lambda k, a, b: a - b),
+    "bb_upper": (lambda k: [("sma", k[1], k[2]), ("std", k[1], k[2])], lambda k, m, s: m + k[3] * s),
+    "bb_lower": (lambda k: [("sma", k[1], k[2]), ("std", k[1], k[2])], lambda k, m, s: m - k[3] * s),
+    "bb_width": (lambda k: [("std", k[1], k[2]), ("sma", k[1], k[2])], lambda k, s, m: 2 * k[3] * s / (m + EPS)),
+    "ibs": (lambda k: [("input", "Close"), ("input", "Low"), ("bar_range",)],
+            lambda k, c, lo, r: np.where(r != 0, (c - lo) / np.where(r != 0, r, 1) * 100, 50.0)),
+    "bar_range": (lambda k: [("input", "High"), ("input", "Low")], lambda k, h, lo: h - lo),
+}
+
+CLOSE = ("input", "Close")
+
+
+def ema_key(src, span):
+    return ("ema", src, 2 / (span + 1))
+
+
+def parse(name):
+    """Indicator name -> graph key."""
+    patterns = [
+        (r"Return", lambda: ("pct", CLOSE)),
+        (r"MA(\d+)", lambda n: ("sma", CLOSE, int(n))),
+        (r"EMA(\d+)", lambda n: ema_key(CLOSE, int(n))),
+        (r"STD(\d+)", lambda n: ("std", CLOSE, int(n))),
+        (r"RSI(\d+)", lambda n: ("rsi", CLOSE, int(n))),
+        (r"MACD", lambda: ("sub", ema_key(CLOSE, 12), ema_key(CLOSE, 26))),
+        (r"MACD_(\d+)_(\d+)", lambda f, s: ("sub", ema_key(CLOSE, int(f)), ema_key(CLOSE, int(s)))),
+        (r"BB_(upper|lower|width)", lambda b: ("bb_" + b, CLOSE, 20, 2.0)),
+        (r"BB_(upper|lower|width)_(\d+)_([\d.]+)", lambda b, n, k: ("bb_" + b, CLOSE, int(n), float(k))),
+        (r"Volatility_(\d+)", lambda n: ("std", ("pct", CLOSE), int(n))),
+        (r"lag_(\d+)", lambda k: ("shift", CLOSE, int(k))),
+        (r"lead_(\d+)", lambda k: ("shift", CLOSE, -int(k))),
+        (r"bar_range", lambda: ("bar_range",)),
+        (r"avg_range_(\d+)", lambda n: ("sma", ("bar_range",), int(n))),
+        (r"ibs", lambda: ("ibs",)),
+    ]
+    for pattern, build in patterns:
+        m = re.fullmatch(pattern, name)
+        if m:
+            return build(*m.groups())
+    raise ValueError(f"Unknown indicator: {name}")
+
+
+def deps(key):
+    if key[0] == "input":
+        return []
+    return NODES[key[0]][0](key)
+
+
+# -----------------------------
+# PLAN
+# -----------------------------
+class Plan:
+    """Indicator names planned into one deduplicated, topologically ordered graph."""
+
+    def __init__(self, names):
+        self.names = list(names)
+        self.outputs = [parse(n) for n in self.names]
+        self.order = []
+        seen = set()
+        for key in self.outputs:
+            self._visit(key, seen)
+
+    def _visit(self, key, seen):
+        if key in seen:
+            return
+        for dep in deps(key):
+            self._visit(dep, seen)
+        seen.add(key)
+        self.order.append(key)
+
+    def inputs(self):
+        return sorted({key[1] for key in self.order if key[0] == "input"})
+
+    def run(self, data, dtype=np.float32):
+        """
+        Evaluate every node once (in float64). data: DataFrame or dict of arrays with the
+        needed input columns (shape (n_bars,) or (n_tickers, n_bars)).
+        Returns a `dtype` matrix with one row per bar (single series) and one
+        column per name; panels get shape (n_tickers, n_bars, n_names).
+        """
+        values = {}
+        for key in self.order:
+            if key[0] == "input":
+                values[key] = np.asarray(data[key[1]], dtype=np.float64)
+            else:
+                fn = NODES[key[0]][1]
+                values[key] = fn(key, *[values[d] for d in deps(key)])
+        return np.stack([values[k] for k in self.outputs], axis=-1).astype(dtype, copy=False)
+
+
+def compute_indicators(data, names, dtype=np.float32):
+    """Feature matrix for `names` computed from data (see Plan.run); float32 unless dtype says otherwise."""
+    return Plan(names).run(data, dtype)
+
+
+def indicator_frame(df, names, dtype=np.float32):
+    """Indicators for a single-ticker DataFrame as a DataFrame sharing df's index."""
+    return pd.DataFrame(compute_indicators(df, names, dtype), index=df.index, columns=list(names))
@@ -0,0 +1,153 @@
+"""
+Pixel-aware OHLC downsampling
+
+A chart never needs more candles than its axis has pixels. OHLCPyramid
+aggregates the bars once into levels of 1, 2, 4, 8, ... bars per bucket
+(first Open, max High, min Low, last Close, summed Volume, last value of any
+extra overlay columns). Each level is built from the one below in O(n) total.
+query() then picks the finest level that fits the requested bucket count and
+slices out the visible buckets, so zooming and panning cost O(visible buckets)
+instead of O(bars).
+
+- OHLCPyramid(df).frame(max_buckets=800): a downsampled OHLCV frame, e.g. for mpf.plot
+- lod_candlestick(ax, df): interactive candles that re-aggregate whenever the
+  x-limits or the figure size change
+"""
+import numpy as np
+import pandas as pd
+
+from candles import candle_colors, candle_collections, candle_verts, date_positions
+
+FIELDS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def _pairs(a, fill):
+    """(first, second) element of every bucket pair; an odd last bucket pairs with `fill`."""
+    if len(a) % 2:
+        a = np.append(a, fill)
+    return a[0::2], a[1::2]
+
+
+def _merge(level):
+    """Next pyramid level: every two neighbouring buckets become one."""
+    out = {}
+    for name, values in level.items():
+        a, b = _pairs(values, np.nan)
+        if name in ("x_first", "Open"):
+            out[name] = np.where(np.isnan(a), b, a)
+        elif name == "High":
+            out[name] = np.fmax(a, b)
+        elif name == "Low":
+            out[name] = np.fmin(a, b)
+        elif name == "Volume":
+            out[name] = np.nansum([a, b], axis=0)
+        else:  # x_last, Close and overlay columns: last value
+            out[name] = np.where(np.isnan(b), a, b)
+    return out
+
+
+class OHLCPyramid:
+    def __init__(self, df, extra=()):
+        """df: OHLC(V) frame; extra: overlay columns (MAs, signals) aggregated as the last value."""
+        self.index = df.index
+        x = date_positions(df.index) if isinstance(df.index, pd.DatetimeIndex) \
+            else np.arange(len(df), dtype=np.float64)
+        base = {"x_first": x, "x_last": x}
+        for name in FIELDS + list(extra):
+            if name in df.columns:
+                base[name] = df[name].to_numpy(dtype=np.float64)
+        self.levels = [base]
+        while len(self.levels[-1]["x_first"]) > 1:
+            self.levels.append(_merge(self.levels[-1]))
+        # spacing of one bar, used to give buckets their width
+        self.spacing = float(np.median(np.diff(x))) if len(x) > 1 else 1.0
+
+    def __len__(self):
+        return len(self.levels[0]["x_first"])
+
+    def level_for(self, n_bars, max_buckets):
+        """Finest level whose buckets for n_bars fit in max_buckets."""
+        level = 0
+        while level + 1 < len(self.levels) and -(-n_bars // (1 << level)) > max_buckets:
+            level += 1
+        return level
+
+    def query(self, x0=None, x1=None, max_buckets=1000):
+        """
+        Buckets covering the bars with x0 <= x <= x1 (x in matplotlib date numbers for a
+        DatetimeIndex, bar positions otherwise). Returns (level, {field: array}) with
+        x_first, x_last, the OHLCV fields and the extra columns.
+        """
+        x = self.levels[0]["x_first"]
+        i0 = 0 if x0 is None else int(np.searchsorted(x, x0, side="left"))
+        i1 = len(x) if x1 is None else int(np.searchsorted(x, x1, side="right"))
+        level = self.level_for(max(i1 - i0, 0), max_buckets)
+        b0, b1 = i0 >> level, -(-i1 // (1 << level))  # whole buckets touching [i0, i1)
+        return level, {name: values[b0:b1] for name, values in self.levels[level].items()}
+
+    def frame(self, start=None, end=None, max_buckets=1000):
+        """Downsampled frame between two dates, indexed by each bucket's first bar."""
+        dated = isinstance(self.index, pd.DatetimeIndex)
+        x0 = date_positions([pd.Timestamp(start)])[0] if dated and start is not None else start
+        x1 = date_positions([pd.Timestamp(end)])[0] if dated and end is not None else end
+        level, buckets = self.query(x0, x1, max_buckets)
+        x = self.levels[0]["x_first"]
+        first_bar = np.searchsorted(x, buckets["x_first"])
+        columns = {k: v for k, v in buckets.items() if k not in ("x_first", "x_last")}
+        return pd.DataFrame(columns, index=self.index[first_bar])
+
+
+# -----------------------------
+# INTERACTIVE CANDLES
+# -----------------------------
+class LODCandles:
+    """Candles on ax that are re-aggregated to the axis width on every zoom, pan or resize."""
+
+    def __init__(self, ax, pyramid, pixels_per_bucket=3, width=0.8, up_color='green',
+                 down_color='red', wick_color='black'):
+        self.ax = ax
+        self.pyramid = pyramid
+        self.pixels_per_bucket = pixels_per_bucket
+        self.width = width  # body width as a fraction of the bucket span
+        self.up_color, self.down_color = up_color, down_color
+        empty = np.empty((0, 2, 2)), np.empty((0, 4, 2))
+        self.wicks, self.bodies = candle_collections(*empty, colors=[], wick_color=wick_color)
+        ax.add_collection(self.wicks, autolim=False)
+        ax.add_collection(self.bodies, autolim=False)
+        self.level = None
+        self._updating = False
+
+        base = pyramid.levels[0]
+        ax.update_datalim([(base["x_first"][0] - pyramid.spacing, np.nanmin(base["Low"])),
+                           (base["x_last"][-1] + pyramid.spacing, np.nanmax(base["High"]))])
+        ax.autoscale_view()
+        ax.callbacks.connect("xlim_changed", lambda _ax: self.update())
+        ax.figure.canvas.mpl_connect("resize_event", lambda _event: self.update())
+        self.update()
+
+    def update(self):
+        if self._updating:
+            return
+        self._updating = True
+        try:
+            x0, x1 = self.ax.get_xlim()
+            max_buckets = max(1, int(self.ax.bbox.width / self.pixels_per_bucket))
+            self.level, b = self.pyramid.query(x0, x1, max_buckets)
+            span = b["x_last"] - b["x_first"] + self.pyramid.spacing
+            center = (b["x_first"] + b["x_last"]) / 2
+            wicks, bodies = candle_verts(center, b["Open"], b["High"], b["Low"], b["Close"],
+                                         span * self.width)
+            self.wicks.set_verts(wicks)
+            self.bodies.set_verts(bodies)
+            self.bodies.set_facecolor(candle_colors(b["Open"], b["Close"], self.up_color, self.down_color))
+            self.ax.figure.canvas.draw_idle()
+        finally:
+            self._updating = False
+
+
+def lod_candlestick(ax, df, pixels_per_bucket=3, **style):
+    """Interactive level-of-detail candles for df; returns the LODCandles handle."""
+    candles = LODCandles(ax, OHLCPyramid(df), pixels_per_bucket, **style)
+    if isinstance(df.index, pd.DatetimeIndex):
+        ax.xaxis_date()
+    return candles
@@ -0,0 +1,99 @@
+"""
+Unified OHLCV normalizer
+
+Every script used to clean yfinance output its own way (col[1] from tuples,
+get_level_values(0) + dedup + apply(pd.to_numeric), a per-column to_numeric
+loop, searching for a "close"-like column). normalize_ohlcv() does it once and
+always returns the canonical schema:
+
+    Open, High, Low, Close   float32
+    Volume                   int64
+    index                    sorted, unique, tz-naive DatetimeIndex named "Date"
+
+The coercion works on the whole price block at once: no per-column Python
+loops. The bytes saved are recorded in df.attrs["normalize"].
+"""
+import numpy as np
+import pandas as pd
+
+PRICE_COLUMNS = ["Open", "High", "Low", "Close"]
+COLUMNS = PRICE_COLUMNS + ["Volume"]
+_CANONICAL = {c.lower(): c for c in COLUMNS}
+
+
+def empty_ohlcv():
+    df = pd.DataFrame(np.empty((0, 4), dtype=np.float32), columns=PRICE_COLUMNS,
+                      index=pd.DatetimeIndex([], name="Date"))
+    df["Volume"] = np.empty(0, dtype=np.int64)
+    return df
+
+
+def _field_level(columns):
+    """Flat Index of field names; for MultiIndex columns pick the level holding Open/High/..."""
+    if not isinstance(columns, pd.MultiIndex):
+        return columns.astype(str)
+    levels = [columns.get_level_values(i).astype(str) for i in range(columns.nlevels)]
+    hits = [lvl.str.lower().isin(_CANONICAL).sum() for lvl in levels]
+    return levels[int(np.argmax(hits))]
+
+
+def _to_datetime_index(index, tz):
+    index = pd.DatetimeIndex(pd.to_datetime(index, utc=False))
+    if index.tz is not None:
+        if tz is not None:
+            index = index.tz_convert(tz)
+        # keep the exchange wall clock, so daily bars stay on their trading date
+        index = index.tz_localize(None)
+    return index.as_unit("ns").rename("Date")
+
+
+def normalize_ohlcv(df, tz=None, dropna=True):
+    """
+    Canonical OHLCV frame from any yfinance / CSV style frame.
+    tz: convert tz-aware indexes to this zone before dropping tz (default: keep local wall clock).
+    dropna: drop bars where any price is missing.
+    """
+    if df is None or df.empty:
+        return empty_ohlcv()
+    bytes_before = int(df.memory_usage(index=True, deep=True).sum())
+
+    fields = _field_level(df.columns).str.lower().map(_CANONICAL)
+    keep = fields.notna() & ~pd.Index(fields).duplicated()
+    raw = df.loc[:, np.asarray(keep)]
+    raw.columns = fields[np.asarray(keep)]
+    missing = [c for c in PRICE_COLUMNS if c not in raw.columns]
+    if missing:
+        raise ValueError(f"Missing OHLC columns {missing}. Columns: {list(df.columns)[:20]}")
+
+    # one coercion over the whole block instead of a to_numeric call per column
+    block = raw.reindex(columns=COLUMNS).to_numpy()
+    if block.dtype == object:
+        block = pd.to_numeric(pd.Series(block.ravel()), errors="coerce").to_numpy(dtype=np.float64).reshape(block.shape)
+    block = block.astype(np.float64, copy=False)
+
+    prices = block[:, :4].astype(np.float32)
+    volume = np.nan_to_num(block[:, 4], nan=0.0).astype(np.int64)
+    index = _to_datetime_index(df.index, tz)
+
+    order = np.argsort(index.values, kind="stable")
+    index, prices, volume = index[order], prices[order], volume[order]
+    mask = ~index.duplicated(keep="last")
+    if dropna:
+        mask &= ~np.isnan(prices).any(axis=1)
+
+    out = pd.DataFrame(prices[mask], index=index[mask], columns=PRICE_COLUMNS)
+    out["Volume"] = volume[mask]
+    bytes_after = int(out.memory_usage(index=True, deep=True).sum())
+    out.attrs["normalize"] = {"bytes_before": bytes_before, "bytes_after": bytes_after,
+                              "bytes_saved": bytes_before - bytes_after}
+    return out
+
+
+def memory_report(df):
+    """One-line summary of the memory normalize_ohlcv() saved on df."""
+    stats = df.attrs.get("normalize")
+    if not stats:
+        return "not normalized"
+    before, after = stats["bytes_before"], stats["bytes_after"]
+    pct = 100 * stats["bytes_saved"] / before if before else 0
+    return f"{before / 1024:.1f} KiB -> {after / 1024:.1f} KiB ({pct:.0f}% saved)"
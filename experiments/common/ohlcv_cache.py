@@ -0,0 +1,248 @@
+"""
+Local incremental OHLCV cache
+
+The experiments used to call yf.download / Ticker.history from scratch on every
+run. download() below is a drop-in replacement that keeps one columnar file set
+per ticker and interval on disk and only asks the provider for the bars that
+are missing since the last sync. Everything else is served locally.
+
+Bars are kept in an OHLCVStore (see ohlcv_store.py): one folder per adjustment
+mode (adjusted / raw), ticker and interval with memory-mapped column files, plus
+a meta.json holding the covered date range and the last sync time. Newly
+synced bars are appended in place. Only fetches that returned bars extend the
+covered range, so a failed or empty fetch is simply retried next time.
+
+Adjusted prices change retroactively after a split or dividend. Every sync
+re-reads the last final cached bar along with the new ones; if its Close moved,
+the whole series is refetched and rewritten instead of appended to.
+
+Providers are pluggable: YahooProvider talks to Yahoo Finance, CsvProvider
+reads <TICKER>.csv files from a directory and stands in for Yahoo offline.
+Every provider returns frames through normalize_ohlcv().
+"""
+import json
+import os
+import time
+
+import numpy as np
+import pandas as pd
+
+from normalize import empty_ohlcv, normalize_ohlcv
+from ohlcv_store import OHLCVStore, to_ns
+
+CACHE_DIR = os.environ.get("STOCKTORCH_CACHE",
+                           os.path.join(os.path.expanduser("~"), ".stocktorch_cache"))
+REFRESH_SECONDS = 15 * 60  # how long today's (still forming) bars are trusted
+ADJUST_TOLERANCE = 1e-4  # relative Close change of an old bar that means the history was re-adjusted
+
+
+# -----------------------------
+# PROVIDERS
+# -----------------------------
+class Provider:
+    """
+    Source of OHLCV bars. Subclasses implement fetch(). `adjustment` ("adjusted" for split /
+    dividend adjusted prices, "raw" otherwise) is part of the cache key.
+    """
+    name = "provider"
+    adjustment = "adjusted"
+
+    def fetch(self, ticker, start, end, interval="1d"):
+        """Return the bars in [start, end) as a normalize_ohlcv() frame."""
+        raise NotImplementedError
+
+
+class YahooProvider(Provider):
+    name = "yahoo"
+
+    def __init__(self, auto_adjust=True):
+        self.auto_adjust = auto_adjust
+        self.adjustment = "adjusted" if auto_adjust else "raw"
+
+    def fetch(self, ticker, start, end, interval="1d"):
+        import yfinance as yf
+        df = yf.download(ticker, start=start, end=end, interval=interval,
+                         auto_adjust=self.auto_adjust, progress=False)
+        return normalize_ohlcv(df)
+
+
+class CsvProvider(Provider):
+    """
+    File-backed provider reading <directory>/<TICKER>.csv (Date,Open,High,Low,Close,Volume).
+    Every fetch is recorded in self.calls so offline tests can check what was requested.
+    """
+    name = "csv"
+
+    def __init__(self, directory, adjustment="adjusted"):
+        self.directory = directory
+        self.adjustment = adjustment
+        self.calls = []
+
+    def fetch(self, ticker, start, end, interval="1d"):
+        self.calls.append((ticker, start, end, interval))
+        path = os.path.join(self.directory, f"{ticker}.csv")
+        if not os.path.exists(path):
+            return empty_ohlcv()
+        df = normalize_ohlcv(pd.read_csv(path, index_col=0, parse_dates=True))
+        return df.loc[(df.index >= start) & (df.index < end)]
+
+
+# -----------------------------
+# CACHE
+# -----------------------------
+class OHLCVCache:
+    def __init__(self, provider=None, cache_dir=CACHE_DIR, refresh_seconds=REFRESH_SECONDS):
+        self.provider = provider if provider is not None else YahooProvider()
+        self.cache_dir = cache_dir
+        self.refresh_seconds = refresh_seconds
+        # adjusted and raw bars of the same ticker and interval live side by side
+        self.store = OHLCVStore(os.path.join(cache_dir, self.provider.adjustment))
+
+    def meta_path(self, ticker, interval):
+        return os.path.join(self.store.path(ticker, interval), "meta.json")
+
+    def load_meta(self, ticker, interval="1d"):
+        """Covered range and last sync time, or None if nothing usable is cached."""
+        path = self.meta_path(ticker, interval)
+        if not os.path.exists(path) or not self.store.exists(ticker, interval):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def load(self, ticker, interval="1d"):
+        """Return (OHLCVSeries, meta) for everything cached, or (None, None)."""
+        meta = self.load_meta(ticker, interval)
+        if meta is None:
+            return None, None
+        return self.store.open(ticker, interval), meta
+
+    def save_meta(self, ticker, interval, start, end):
+        """Record [start, end) as covered and synced now; returns the new meta."""
+        meta = {"start": start.isoformat(), "end": end.isoformat(), "synced_at": time.time(),
+                "provider": self.provider.name}
+        tmp = self.meta_path(ticker, interval) + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump(meta, f)
+        os.replace(tmp, self.meta_path(ticker, interval))
+        return meta
+
+    def missing_ranges(self, meta, start, end):
+        """Date ranges in [start, end) that are not covered by the cached data."""
+        if meta is None:
+            return [(start, end)]
+        lo, hi = pd.Timestamp(meta["start"]), pd.Timestamp(meta["end"])
+        ranges = []
+        if start < lo:
+            ranges.append((start, lo))
+        if end > hi:
+            today = pd.Timestamp.today().normalize()
+            # bars before `hi` are final; the last day is re-synced once the refresh window expires
+            if hi < today or time.time() - meta["synced_at"] > self.refresh_seconds:
+                ranges.append((min(hi, today), end))
+        return ranges
+
+    def fetch(self, ticker, start, end, interval="1d"):
+        """Provider bars in [start, end), or None when it returned nothing."""
+        df = self.provider.fetch(ticker, start, end, interval)
+        return None if df is None or df.empty else df
+
+    def last_final_bar(self, ticker, interval, today):
+        """(timestamp, Close) of the last cached bar before today, or None."""
+        series = self.store.open(ticker, interval)
+        k = int(np.searchsorted(series.index, to_ns(today), side="left")) - 1
+        if k < 0:
+            return None
+        return pd.Timestamp(int(series.index[k])), float(series.columns["Close"][k])
+
+    def replace(self, ticker, interval, meta, start, end, today):
+        """Refetch [start, end) in one call and rewrite the files with it."""
+        bars = self.fetch(ticker, start, end, interval)
+        if bars is None:
+            return meta
+        self.store.write(ticker, interval, bars)
+        hi = min(end, today) if meta is None else max(pd.Timestamp(meta["end"]), min(end, today))
+        return self.save_meta(ticker, interval, start, hi)
+
+    def sync(self, ticker, interval, meta, ranges, start, end):
+        """
+        Fetch the missing ranges and store them. The covered range only grows over fetches that
+        returned bars, so a failed or empty fetch is retried on the next call instead of being
+        recorded as covered. Returns the new meta (the old one, maybe None, if nothing came back).
+        """
+        today = pd.Timestamp.today().normalize()
+        if meta is None or ranges[0][0] < pd.Timestamp(meta["start"]):
+            # nothing cached, or older history than ever fetched: one fetch for the whole span, so
+            # every stored bar is on the same split / dividend adjustment
+            if meta is None:
+                return self.replace(ticker, interval, meta, start, end, today)
+            return self.replace(ticker, interval, meta, start, max(end, pd.Timestamp(meta["end"])), today)
+
+        lo, hi = pd.Timestamp(meta["start"]), pd.Timestamp(meta["end"])
+        tail_start, tail_end = ranges[0]
+        # re-read the last final cached bar with the new ones and compare
+        anchor = self.last_final_bar(ticker, interval, today)
+        if anchor is not None:
+            tail_start = min(tail_start, anchor[0])
+        bars = self.fetch(ticker, tail_start, tail_end, interval)
+        if bars is None:
+            return meta
+        if anchor is not None and anchor[0] in bars.index:
+            close = float(bars.loc[anchor[0], "Close"])
+            if abs(close - anchor[1]) > ADJUST_TOLERANCE * abs(anchor[1]):
+                # a split or dividend since the last sync re-adjusted the history: rewrite all of it
+                return self.replace(ticker, interval, meta, lo, tail_end, today)
+        self.store.append(ticker, interval, bars)
+        return self.save_meta(ticker, interval, lo, max(hi, min(tail_end, today)))
+
+    def get(self, ticker, start, end=None, interval="1d"):
+        """Bars for ticker in [start, end), fetching only what the cache lacks."""
+        start = pd.Timestamp(start)
+        end = pd.Timestamp(end) if end is not None else pd.Timestamp.today().normalize() + pd.Timedelta(days=1)
+        meta = self.load_meta(ticker, interval)
+        ranges = self.missing_ranges(meta, start, end)
+        if ranges:
+            meta = self.sync(ticker, interval, meta, ranges, start, end)
+        if meta is None:
+            return empty_ohlcv()
+        return self.store.open(ticker, interval).to_frame(start, end)
+
+
+# -----------------------------
+# DROP-IN DOWNLOAD
+# -----------------------------
+_default_caches = {}
+
+
+def default_cache(auto_adjust=True):
+    """Shared Yahoo-backed cache for adjusted or raw (auto_adjust=False) bars."""
+    if auto_adjust not in _default_caches:
+        _default_caches[auto_adjust] = OHLCVCache(YahooProvider(auto_adjust))
+    return _default_caches[auto_adjust]
+
+
+def period_start(period, today=None):
+    """Translate a yfinance period string ('30d', '3mo', '1y', 'ytd', 'max') into a start date."""
+    today = pd.Timestamp.today().normalize() if today is None else pd.Timestamp(today)
+    period = period.lower()
+    if period == "max":
+        return pd.Timestamp("1970-01-01")
+    if period == "ytd":
+        return pd.Timestamp(year=today.year, month=1, day=1)
+    for suffix, unit in [("mo", "months"), ("wk", "weeks"), ("d", "days"), ("y", "years")]:
+        if period.endswith(suffix):
+            return today - pd.DateOffset(**{unit: int(period[:-len(suffix)])})
+    raise ValueError(f"Unsupported period: {period}")
+
+
+def download(ticker, start=None, end=None, period=None, interval="1d", auto_adjust=True, cache=None):
+    """
+    Cached replacement for yf.download(ticker, ...) for a single ticker.
+    Returns a DataFrame with flat Open/High/Low/Close/Volume columns.
+    """
+    cache = cache if cache is not None else default_cache(auto_adjust)
+    if cache.provider.adjustment != ("adjusted" if auto_adjust else "raw"):
+        raise ValueError(f"auto_adjust={auto_adjust} does not match the cache's "
+                         f"{cache.provider.adjustment} provider")
+    if start is None:
+        start = period_start(period or "max")
+    return cache.get(ticker, start, end, interval)
@@ -0,0 +1,189 @@
+"""
+Memory-mapped columnar OHLCV store
+
+Each ticker/interval is a folder of raw, contiguous column files:
+
+    index.i64    sorted int64 timestamps (ns since epoch)
+    Open.f32     float32 prices
+    High.f32
+    Low.f32
+    Close.f32
+    Volume.i64   int64 volume
+    store.json   number of rows and version of the column files
+
+Columns are opened with np.memmap, so nothing is read until it is touched and
+date slices are plain NumPy views into the mapped files (no copies). The index
+is sorted, so a [start, end) lookup is two binary searches.
+
+New bars after the stored ones are appended in place: readers only map the rows
+store.json listed when they opened, and those bytes never change. Replacing
+stored rows (an overlapping tail, or write()) never touches the files readers
+may have mapped: the kept rows and the new ones go to a new version of every
+column file (Open.3.f32, ...), published by replacing store.json, and the old
+version is deleted after that. Version 0 files have no number (Open.f32).
+
+to_frame() is the thin adapter for code that wants a pandas DataFrame.
+"""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+DTYPES = {"index": np.int64, "Open": np.float32, "High": np.float32, "Low": np.float32,
+          "Close": np.float32, "Volume": np.int64}
+SUFFIX = {np.int64: "i64", np.float32: "f32"}
+COLUMNS = ["Open", "High", "Low", "Close", "Volume"]
+
+
+def column_path(folder, name, version=0):
+    suffix = SUFFIX[DTYPES[name]]
+    return os.path.join(folder, f"{name}.{suffix}" if version == 0 else f"{name}.{version}.{suffix}")
+
+
+def to_ns(t):
+    """Timestamp-like value -> int64 nanoseconds, matching the stored index."""
+    return pd.Timestamp(t).value
+
+
+class OHLCVSeries:
+    """Read-only memory-mapped view of one ticker/interval."""
+
+    def __init__(self, folder, length, version=0):
+        self.folder = folder
+        self.length = length
+        self.version = version
+        self.index = self._map("index")
+        self.columns = {c: self._map(c) for c in COLUMNS}
+
+    def _map(self, name):
+        dtype = DTYPES[name]
+        if self.length == 0:
+            return np.empty(0, dtype=dtype)
+        path = column_path(self.folder, name, self.version)
+        return np.memmap(path, dtype=dtype, mode="r", shape=(self.length,))
+
+    def __len__(self):
+        return self.length
+
+    def locate(self, start=None, end=None):
+        """Row positions [i, j) covering timestamps in [start, end)."""
+        i = 0 if start is None else int(np.searchsorted(self.index, to_ns(start), side="left"))
+        j = self.length if end is None else int(np.searchsorted(self.index, to_ns(end), side="left"))
+        return i, j
+
+    def column(self, name, start=None, end=None):
+        """Zero-copy view of one column for [start, end)."""
+        i, j = self.locate(start, end)
+        return self.columns[name][i:j]
+
+    def slice(self, start=None, end=None):
+        """Zero-copy views of the index and every column for [start, end)."""
+        i, j = self.locate(start, end)
+        out = {c: self.columns[c][i:j] for c in COLUMNS}
+        out["index"] = self.index[i:j]
+        return out
+
+    def to_frame(self, start=None, end=None):
+        """pandas DataFrame for [start, end), for code that needs one."""
+        views = self.slice(start, end)
+        index = pd.DatetimeIndex(np.asarray(views.pop("index")).view("datetime64[ns]"), name="Date")
+        return pd.DataFrame({c: np.asarray(v) for c, v in views.items()}, index=index)
+
+
+class OHLCVStore:
+    def __init__(self, root):
+        self.root = root
+
+    def path(self, ticker, interval="1d"):
+        return os.path.join(self.root, f"{ticker.upper()}_{interval}")
+
+    def meta(self, ticker, interval="1d"):
+        """store.json of ticker/interval ({"length", "version"}), None if not stored."""
+        meta_path = os.path.join(self.path(ticker, interval), "store.json")
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path) as f:
+            meta = json.load(f)
+        meta.setdefault("version", 0)
+        return meta
+
+    def length(self, ticker, interval="1d"):
+        meta = self.meta(ticker, interval)
+        return None if meta is None else meta["length"]
+
+    def exists(self, ticker, interval="1d"):
+        return self.meta(ticker, interval) is not None
+
+    def open(self, ticker, interval="1d"):
+        meta = self.meta(ticker, interval)
+        if meta is None:
+            raise KeyError(f"{ticker} {interval} is not in the store")
+        return OHLCVSeries(self.path(ticker, interval), meta["length"], meta["version"])
+
+    def write(self, ticker, interval, df):
+        """Replace everything stored for ticker/interval with df."""
+        self._write_from(ticker, interval, df, 0)
+
+    def append(self, ticker, interval, df):
+        """Add bars from df; stored bars at or after df's first timestamp are replaced."""
+        if df.empty:
+            return
+        if not self.exists(ticker, interval):
+            return self.write(ticker, interval, df)
+        series = self.open(ticker, interval)
+        keep = int(np.searchsorted(series.index, to_ns(df.index[0]), side="left"))
+        del series
+        self._write_from(ticker, interval, df, keep)
+
+    def _write_from(self, ticker, interval, df, keep):
+        """Store the first `keep` stored rows followed by df."""
+        folder = self.path(ticker, interval)
+        os.makedirs(folder, exist_ok=True)
+        df = df[~df.index.duplicated(keep="last")].sort_index()
+        arrays = {"index": pd.DatetimeIndex(df.index).values.astype("datetime64[ns]").view(np.int64)}
+        for c in COLUMNS:
+            values = df[c].to_numpy() if c in df.columns else np.zeros(len(df))
+            if c == "Volume":
+                values = np.nan_to_num(values.astype(np.float64))
+            arrays[c] = np.ascontiguousarray(values, dtype=DTYPES[c])
+
+        meta = self.meta(ticker, interval) or {"length": 0, "version": 0}
+        version = meta["version"]
+        if keep >= meta["length"]:
+            # pure append: truncating only drops bytes past the published length
+            # (left by an interrupted write), which no reader has mapped
+            for name, values in arrays.items():
+                with open(column_path(folder, name, version), "ab") as f:
+                    f.truncate(keep * np.dtype(DTYPES[name]).itemsize)
+                    f.write(values.tobytes())
+        else:
+            # rows readers may have mapped change: write a new version next to the old one
+            version += 1
+            for name, values in arrays.items():
+                nbytes = keep * np.dtype(DTYPES[name]).itemsize
+                with open(column_path(folder, name, version), "wb") as f:
+                    if nbytes:
+                        with open(column_path(folder, name, meta["version"]), "rb") as old:
+                            f.write(old.read(nbytes))
+                    f.write(values.tobytes())
+
+        # store.json is replaced last and atomically: until then readers and a crashed
+        # writer's successor see the previous length and version, whose bytes are intact
+        tmp = os.path.join(folder, "store.json.tmp")
+        with open(tmp, "w") as f:
+            json.dump({"length": keep + len(df), "version": version}, f)
+        os.replace(tmp, os.path.join(folder, "store.json"))
+        if version != meta["version"]:
+            self._remove_versions(folder, version)
+
+    def _remove_versions(self, folder, current):
+        """Delete column files of other versions (open maps keep their pages until closed)."""
+        current_files = {os.path.basename(column_path(folder, name, current)) for name in DTYPES}
+        for entry in os.scandir(folder):
+            name = entry.name.split(".", 1)[0]
+            if name in DTYPES and entry.name not in current_files:
+                try:
+                    os.remove(entry.path)
+                except OSError:  # still mapped on Windows: removed by the next rewrite
+                    pass
@@ -0,0 +1,176 @@
+"""
+Streaming O(1)-per-bar indicators
+
+Stateful versions of the batch indicators for live bars. Every object keeps a
+fixed amount of state and update(value) costs constant time, so a new tick does
+not recompute ewm / rolling / compute_rsi over the whole history. Results match
+the pandas batch versions (ewm(adjust=False), rolling(n)) to floating-point
+tolerance; until a window is full, update() returns NaN like pandas does.
+
+StreamingZenSignals combines them into the zen_ai_signals bull/bear logic bar by bar.
+"""
+import math
+from collections import deque
+
+NAN = float("nan")
+
+
+class EMA:
+    """pandas ewm(span=span, adjust=False).mean(); pass alpha instead of span for Wilder smoothing."""
+
+    def __init__(self, span=None, alpha=None):
+        self.alpha = alpha if alpha is not None else 2 / (span + 1)
+        self.value = NAN
+
+    def update(self, x):
+        if math.isnan(x):
+            return self.value
+        self.value = x if math.isnan(self.value) else self.value + self.alpha * (x - self.value)
+        return self.value
+
+
+class RollingWindow:
+    """Fixed-size window with a running (centered) sum and sum of squares."""
+
+    RESYNC = 64  # re-center and re-sum every RESYNC * n bars (amortized O(1)) to bound rounding drift
+
+    def __init__(self, n):
+        self.n = n
+        self.values = deque()
+        self.center = None
+        self.s1 = 0.0
+        self.s2 = 0.0
+        self.nans = 0
+        self.pushes = 0
+
+    def push(self, x):
+        if self.center is None and not math.isnan(x):
+            self.center = x
+        self.values.append(x)
+        self._add(x, 1)
+        if len(self.values) > self.n:
+            self._add(self.values.popleft(), -1)
+        self.pushes += 1
+        if self.pushes % (self.RESYNC * self.n) == 0:
+            self._resync()
+
+    def _resync(self):
+        finite = [v for v in self.values if not math.isnan(v)]
+        if finite:
+            self.center = sum(finite) / len(finite)
+        self.s1 = sum(v - self.center for v in finite)
+        self.s2 = sum((v - self.center) ** 2 for v in finite)
+
+    def _add(self, x, sign):
+        if math.isnan(x):
+            self.nans += sign
+            return
+        d = x - self.center
+        self.s1 += sign * d
+        self.s2 += sign * d * d
+
+    def full(self):
+        return len(self.values) == self.n and self.nans == 0
+
+
+class SMA(RollingWindow):
+    """pandas rolling(n).mean()"""
+
+    def update(self, x):
+        self.push(x)
+        return self.s1 / self.n + self.center if self.full() else NAN
+
+
+class RollingStd(RollingWindow):
+    """pandas rolling(n).std() (sample std, ddof=1)"""
+
+    def update(self, x):
+        self.push(x)
+        if not self.full() or self.n < 2:
+            return NAN
+        var = (self.s2 - self.s1 * self.s1 / self.n) / (self.n - 1)
+        return math.sqrt(max(var, 0.0))
+
+
+class Bollinger:
+    """Mean, upper and lower band over n bars with k standard deviations."""
+
+    def __init__(self, n=20, k=2.0):
+        self.k = k
+        self.window = RollingWindow(n)
+
+    def update(self, x):
+        w = self.window
+        w.push(x)
+        if not w.full():
+            return NAN, NAN, NAN
+        mean = w.s1 / w.n + w.center
+        std = math.sqrt(max((w.s2 - w.s1 * w.s1 / w.n) / (w.n - 1), 0.0))
+        return mean, mean + self.k * std, mean - self.k * std
+
+
+class RSI:
+    """Wilder RSI, same as compute_rsi / indicators RSI<n>."""
+
+    def __init__(self, period=14):
+        self.gain = EMA(alpha=1 / period)
+        self.loss = EMA(alpha=1 / period)
+        self.prev = NAN
+
+    def update(self, x):
+        delta = x - self.prev
+        self.prev = x
+        if math.isnan(delta):
+            return NAN
+        g = self.gain.update(max(delta, 0.0))
+        l = self.loss.update(max(-delta, 0.0))
+        return 100 - 100 / (1 + g / (l + 1e-12))
+
+
+class AverageRange:
+    """Rolling mean of the bar range (High - Low)."""
+
+    def __init__(self, n=8):
+        self.sma = SMA(n)
+
+    def update(self, high, low):
+        return self.sma.update(high - low)
+
+
+def ibs(high, low, close):
+    """Internal bar strength in percent; 50 for a zero-range bar."""
+    bar_range = high - low
+    return (close - low) / bar_range * 100 if bar_range != 0 else 50.0
+
+
+class StreamingZenSignals:
+    """
+    zen_ai_signals evaluated one bar at a time. update() returns the same
+    (bull_signal, bear_signal) pair the batch function gives for that bar.
+    """
+
+    def __init__(self, ma_length=20, use_ema=True, ibs_bull_min=65.0, ibs_bear_max=35.0,
+                 abr_lookback=8):
+        self.ma = EMA(span=ma_length) if use_ema else SMA(ma_length)
+        self.avg_range = AverageRange(abr_lookback)
+        self.ibs_bull_min = ibs_bull_min
+        self.ibs_bear_max = ibs_bear_max
+        self.prev = None  # (open, close, bar_range, ibs) of the previous bar
+
+    def update(self, open_, high, low, close):
+        ma = self.ma.update(close)
+        avg_range = self.avg_range.update(high, low)
+        bar_range = high - low
+        bar_ibs = ibs(high, low, close)
+
+        bull = bear = False
+        if self.prev is not None:
+            p_open, p_close, p_range, p_ibs = self.prev
+            # NaN comparisons are False, exactly like the pandas version
+            range_ok = bar_range > avg_range or p_range > avg_range
+            bull = (close > open_ and p_close > p_open and close > ma and p_close > ma and
+                    bar_ibs > self.ibs_bull_min and p_ibs > self.ibs_bull_min and range_ok)
+            bear = (close < open_ and p_close < p_open and close < ma and p_close < ma and
+                    bar_ibs < self.ibs_bear_max and p_ibs < self.ibs_bear_max and range_ok)
+        self.prev = (open_, close, bar_range, bar_ibs)
+        return bull, bear